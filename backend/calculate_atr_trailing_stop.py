@@ -72,11 +72,11 @@ def resample_to_weekly(df):
         })
         return w['Open'], w['High'], w['Low'], w['Close']
 
-def calculate_atr(high, low, close, length):
+def calculate_true_range(high, low, close):
     """
-    Calculate ATR (Wilder's Smoothing) using Pandas Vectorization.
+    Calculate True Range. It does not depend on the ATR length, so it is computed once
+    and shared by the fast and slow ATR.
     """
-    logging.info(f"  Calculating ATR ({length})...")
     prev_close = close.shift(1)
 
     # Numpy for max calculation
@@ -84,13 +84,20 @@ def calculate_atr(high, low, close, length):
     l = low.values
     pc = prev_close.values
 
+    # np.fmax skips NaN like nanmax, without stacking three temporaries
     with np.errstate(invalid='ignore'):
-        tr1 = h - l
-        tr2 = np.abs(h - pc)
-        tr3 = np.abs(l - pc)
-        tr_vals = np.nanmax(np.stack([tr1, tr2, tr3]), axis=0)
+        tr_vals = np.fmax(np.fmax(h - l, np.abs(h - pc)), np.abs(l - pc))
 
-    tr = pd.DataFrame(tr_vals, index=close.index, columns=close.columns)
+    return pd.DataFrame(tr_vals, index=close.index, columns=close.columns)
+
+def calculate_atr(high, low, close, length, tr=None):
+    """
+    Calculate ATR (Wilder's Smoothing) using Pandas Vectorization.
+    tr: optional precomputed True Range (see calculate_true_range).
+    """
+    logging.info(f"  Calculating ATR ({length})...")
+    if tr is None:
+        tr = calculate_true_range(high, low, close)
 
     # RMA (Wilder's MA) is EWM with alpha = 1/length
     atr = tr.ewm(alpha=1/length, adjust=False, min_periods=length).mean()
@@ -220,30 +227,34 @@ def calculate_trailing_stop_numba(close_arr, atr_arr, multiplier):
     return trail
 
 @jit(nopython=True, parallel=True)
-def compute_all_trails(close_matrix, atr_matrix, multiplier):
+def compute_trail_pair(close_matrix, fast_atr_matrix, slow_atr_matrix, fast_multiplier, slow_multiplier):
     """
-    Compute trails for all stocks in parallel.
-    close_matrix: (n_days, n_stocks)
-    atr_matrix: (n_days, n_stocks)
+    Compute fast and slow trails in one parallel pass over the stocks,
+    so each close column is walked while it is still in cache.
     """
     n_days, n_stocks = close_matrix.shape
-    result = np.zeros((n_days, n_stocks))
+    fast = np.zeros((n_days, n_stocks))
+    slow = np.zeros((n_days, n_stocks))
 
     for j in prange(n_stocks):
-        result[:, j] = calculate_trailing_stop_numba(close_matrix[:, j], atr_matrix[:, j], multiplier)
+        c = close_matrix[:, j]
+        fast[:, j] = calculate_trailing_stop_numba(c, fast_atr_matrix[:, j], fast_multiplier)
+        slow[:, j] = calculate_trailing_stop_numba(c, slow_atr_matrix[:, j], slow_multiplier)
 
-    return result
+    return fast, slow
 
 def calculate_strategies(close, high, low, atr_length_1, atr_mult_1, atr_length_2, atr_mult_2):
     """
     Main calculation wrapper.
     """
-    # 1. Calculate ATRs (Pandas - Vectorized)
+    # 1. Calculate ATRs (Pandas - Vectorized) from one shared True Range
+    tr = calculate_true_range(high, low, close)
+
     logging.info("Calculating Fast ATR...")
-    atr1 = calculate_atr(high, low, close, atr_length_1)
+    atr1 = calculate_atr(high, low, close, atr_length_1, tr=tr)
 
     logging.info("Calculating Slow ATR...")
-    atr2 = calculate_atr(high, low, close, atr_length_2)
+    atr2 = calculate_atr(high, low, close, atr_length_2, tr=tr)
 
     # 2. Prepare Numpy Arrays
     logging.info("Preparing data for Numba...")
@@ -253,11 +264,8 @@ def calculate_strategies(close, high, low, atr_length_1, atr_mult_1, atr_length_
     atr2_vals = atr2.values.astype(np.float64)
 
     # 3. Calculate Trails (Numba - Parallel)
-    logging.info("Computing Fast Trails (Numba Parallel)...")
-    trail1_vals = compute_all_trails(close_vals, atr1_vals, float(atr_mult_1))
-
-    logging.info("Computing Slow Trails (Numba Parallel)...")
-    trail2_vals = compute_all_trails(close_vals, atr2_vals, float(atr_mult_2))
+    logging.info("Computing Fast and Slow Trails (Numba Parallel)...")
+    trail1_vals, trail2_vals = compute_trail_pair(close_vals, atr1_vals, atr2_vals, float(atr_mult_1), float(atr_mult_2))
 
     # 4. Reconstruct DataFrames
     trail1 = pd.DataFrame(trail1_vals, index=close.index, columns=close.columns)
@@ -290,7 +298,7 @@ def calculate_strategies(close, high, low, atr_length_1, atr_mult_1, atr_length_
     # Sell: Crossunder(T1, T2) -> T1 < T2 now AND T1 >= T2 prev
 
     t1_gt_t2 = trail1 > trail2
-    t1_gt_t2_prev = t1_gt_t2.shift(1).fillna(False).astype(bool)
+    t1_gt_t2_prev = t1_gt_t2.shift(1, fill_value=False)
 
     signals = pd.DataFrame(0, index=close.index, columns=close.columns)
 
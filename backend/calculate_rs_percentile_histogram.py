@@ -83,8 +83,8 @@ def calculate_rs_percentile(stocks_weekly, bench_weekly, mode="1M", lookback_1m=
 
     # Align
     common_index = stocks_weekly.index.intersection(bench_weekly.index)
-    stocks = stocks_weekly.loc[common_index].copy()
-    bench = bench_weekly.loc[common_index].copy()
+    stocks = stocks_weekly.loc[common_index]
+    bench = bench_weekly.loc[common_index]
 
     if isinstance(bench, pd.DataFrame):
         if 'Close' in bench.columns:
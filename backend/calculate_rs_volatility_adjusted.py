@@ -16,6 +16,7 @@ import yfinance as yf
 import logging
 import argparse
 from datetime import datetime, timedelta
+from numba import jit, prange
 
 # Configuration
 DATA_FOLDER = "data"
@@ -138,37 +139,16 @@ def calculate_atr(high, low, close, length):
     # Previous Close
     prev_close = close.shift(1)
 
-    # TR Calculation (Vectorized)
-    # tr1 = high - low
-    # tr2 = abs(high - prev_close)
-    # tr3 = abs(low - prev_close)
-    # tr = max(tr1, tr2, tr3)
-
-    tr1 = high - low
-    tr2 = (high - prev_close).abs()
-    tr3 = (low - prev_close).abs()
-
-    tr = pd.concat([tr1, tr2, tr3], axis=0, keys=['1','2','3']).groupby(level=1).max()
-    # Note: The concat method above might be memory intensive or tricky with MultiIndex alignment.
-    # Better: Use numpy maximum
-
-    # Align DataFrames
-    # tr2 and tr3 might have NaNs at the start.
-
-    # Ensuring values are floats
+    # TR Calculation (Vectorized), on the raw arrays
     h = high.values
     l = low.values
     pc = prev_close.values
 
-    # Numpy vectorized max
     # Note: pc has NaN at index 0.
+    # np.fmax skips NaN like nanmax, so if prev_close is NaN, TR is High-Low,
+    # without stacking three temporaries.
     with np.errstate(invalid='ignore'):
-        t2 = np.abs(h - pc)
-        t3 = np.abs(l - pc)
-        # tr = np.maximum(h - l, np.maximum(t2, t3))
-        # Careful with NaN propagation.
-        # If prev_close is NaN, TR is High-Low (usually).
-        tr_vals = np.nanmax(np.stack([h-l, t2, t3]), axis=0)
+        tr_vals = np.fmax(np.fmax(h - l, np.abs(h - pc)), np.abs(l - pc))
 
     tr = pd.DataFrame(tr_vals, index=close.index, columns=close.columns)
 
@@ -178,41 +158,42 @@ def calculate_atr(high, low, close, length):
 
     return atr
 
+@jit(nopython=True, parallel=True)
+def wma_matrix(values, length):
+    """
+    Rolling WMA down each column (weights 1..length).
+    A window containing any NaN yields NaN, matching the previous rolling().apply() version.
+    """
+    n_rows, n_cols = values.shape
+    out = np.full((n_rows, n_cols), np.nan)
+    sum_weights = length * (length + 1) / 2.0
+
+    # Columns (tickers) are independent, so spread them across cores
+    for j in prange(n_cols):
+        for i in range(length - 1, n_rows):
+            acc = 0.0
+            valid = True
+            start = i - length + 1
+            for k in range(length):
+                v = values[start + k, j]
+                if np.isnan(v):
+                    valid = False
+                    break
+                acc += v * (k + 1)
+            if valid:
+                out[i, j] = acc / sum_weights
+    return out
+
 def calculate_wma(series, length):
     """Weighted Moving Average (needed for HMA)."""
-    # WMA = sum(price * weight) / sum(weights)
-    # Weights = 1, 2, ..., length
-    # Pandas doesn't have built-in WMA.
-    # Implementation using rolling apply (slow) or strided rolling (fast).
-    # Since we need vectorized over columns, rolling apply is acceptable if efficient,
-    # but strictly WMA can be computed as:
-    # WMA = (Rolling Sum of (Sum of prices)) ? No.
-
-    # Vectorized WMA:
-    # We can iterate using rolling(window=length) and apply dot product.
-    # For large datasets, this might be slow.
-    # Optimization: Use convolution?
-
-    weights = np.arange(1, length + 1)
-    sum_weights = weights.sum()
-
-    def wma_func(x):
-        if np.isnan(x).any(): return np.nan
-        return np.dot(x, weights) / sum_weights
-
-    # This is slow for 5000 columns.
-    # Alternative: construct linear combination manually?
-    # Or assume for now that standard rolling.mean (SMA) is enough approximation if WMA is too heavy?
-    # User requested HMA. HMA requires WMA.
-
-    # Fast WMA using Numba or pure numpy rolling tricks?
-    # Let's stick to a simple construct_wma helper that loops over columns if needed,
-    # OR use the 'triangular' window type in rolling? No, WMA is linear weights.
-
-    # Let's try pandas standard `.rolling().apply()` with raw=True and engine='numba' if installed.
-    # Since numba is in requirements (from pandas-ta), we can try.
-
-    return series.rolling(window=length).apply(wma_func, raw=True)
+    # WMA = sum(price * weight) / sum(weights), Weights = 1, 2, ..., length
+    # rolling().apply() with a Python function was the bottleneck over ~5000 columns,
+    # so all columns are computed in one JIT-compiled pass instead.
+    # Fortran order keeps each column contiguous for the per-column inner loop.
+    values = np.asfortranarray(series.to_numpy(dtype=np.float64))
+    if values.ndim == 1:
+        return pd.Series(wma_matrix(values.reshape(-1, 1), length)[:, 0], index=series.index)
+    return pd.DataFrame(wma_matrix(values, length), index=series.index, columns=series.columns)
 
 def calculate_hma(series, length):
     """Hull Moving Average."""
@@ -317,24 +298,18 @@ def calculate_rs_volatility_adjusted(stock_data_dict, bench_data_dict, lookback,
     # 1: Improving (RS < 0 & RS > MA)
     # 0: Weak (RS < 0 & RS < MA)
 
-    trend_state = pd.DataFrame(0, index=rs.index, columns=rs.columns)
-
-    # Masks
-    rs_gt_0 = rs > 0
-    rs_gt_ma = rs > rs_ma
-
-    # Vectorized assignment
-    # Init 0
-    # Improving: ~rs_gt_0 & rs_gt_ma -> 1
-    trend_state[ (~rs_gt_0) & rs_gt_ma ] = 1
-    # Weakening: rs_gt_0 & ~rs_gt_ma -> 2
-    trend_state[ rs_gt_0 & (~rs_gt_ma) ] = 2
-    # Strong: rs_gt_0 & rs_gt_ma -> 3
-    trend_state[ rs_gt_0 & rs_gt_ma ] = 3
-
-    # Propagate NaNs where data is invalid
-    invalid_mask = rs.isna() | rs_ma.isna()
-    trend_state[invalid_mask] = -1 # Or NaN, but int is requested. Let's use -1 for invalid.
+    # Codes follow directly from the two bits: 2 * (RS > 0) + (RS > MA)
+    rs_v = rs.to_numpy(dtype=float)
+    ma_v = rs_ma.to_numpy(dtype=float)
+    codes = 2 * (rs_v > 0) + (rs_v > ma_v)
+
+    # Mark invalid data with -1 (int is requested, so not NaN)
+    invalid_mask = np.isnan(rs_v) | np.isnan(ma_v)
+    trend_state = pd.DataFrame(
+        np.where(invalid_mask, -1, codes).astype(np.int64),
+        index=rs.index,
+        columns=rs.columns,
+    )
 
     # Remove initial buffer (NaNs)
     valid_start = max(ATR_LENGTH, LOOKBACK_LENGTH) + MA_LENGTH
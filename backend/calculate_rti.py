@@ -11,6 +11,7 @@ Output:
 import os
 import pandas as pd
 import numpy as np
+import bottleneck as bn
 import logging
 import argparse
 from datetime import datetime
@@ -72,24 +73,36 @@ def calculate_rti(high, low, length):
     volatility = high - low
 
     # 2. Min/Max Volatility
-    max_vol = volatility.rolling(window=length).max()
-    min_vol = volatility.rolling(window=length).min()
+    # bottleneck's move_max/move_min use a monotonic deque (O(N) per column), all columns in one call
+    if len(volatility) >= length:
+        vol_vals = volatility.to_numpy(dtype=float)
+        max_vol = pd.DataFrame(bn.move_max(vol_vals, window=length, min_count=length, axis=0),
+                               index=volatility.index, columns=volatility.columns)
+        min_vol = pd.DataFrame(bn.move_min(vol_vals, window=length, min_count=length, axis=0),
+                               index=volatility.index, columns=volatility.columns)
+    else:
+        max_vol = volatility.rolling(window=length).max()
+        min_vol = volatility.rolling(window=length).min()
 
     # 3. RTI Calculation
     # rti = 100 * (vol - min) / (max - min)
-    denominator = max_vol - min_vol
-    # Handle division by zero (replace 0 with NaN or inf, then fillna)
-    denominator = denominator.replace(0, np.nan)
+    # Worked on plain arrays in place; wrapped back into DataFrames at the end.
+    vol_v = volatility.to_numpy(dtype=float)
+    min_v = min_vol.to_numpy(dtype=float)
+    denominator = max_vol.to_numpy(dtype=float) - min_v
+    # Handle division by zero (zero range -> NaN)
+    denominator[denominator == 0] = np.nan
 
-    rti = 100 * (volatility - min_vol) / denominator
+    rti_v = 100 * (vol_v - min_v) / denominator
 
     # 4. Signals
     logging.info("Generating Signals...")
 
-    rti_prev = rti.shift(1)
+    rti_prev = np.full_like(rti_v, np.nan)
+    rti_prev[1:] = rti_v[:-1]
 
     # Condition: Below 20
-    below_20 = rti < 20
+    below_20 = rti_v < 20
 
     # Condition: Consecutive Below 20 (Orange Dot)
     # Logic: Two or more consecutive bars below 20.
@@ -104,7 +117,7 @@ def calculate_rti(high, low, length):
 
     # Condition: Expansion (Green Line)
     # rti_prev <= 20 and rti >= 2 * rti_prev
-    expansion = (rti_prev <= 20) & (rti >= 2 * rti_prev)
+    expansion = (rti_prev <= 20) & (rti_v >= 2 * rti_prev)
 
     # 5. Signal Encoding
     # 0: Normal
@@ -112,7 +125,7 @@ def calculate_rti(high, low, length):
     # 2: Super Tight (Orange Dot)
     # 3: Expansion
 
-    signals = pd.DataFrame(0, index=rti.index, columns=rti.columns)
+    signals = np.zeros(rti_v.shape, dtype=np.int64)
 
     # Apply priority: Expansion > Dot > Tight > Normal
     # Wait, Pine plots dot as shape, and line color. Can happen same time?
@@ -133,7 +146,10 @@ def calculate_rti(high, low, length):
     signals[expansion] = 3
 
     # NaN propagation
-    signals[rti.isna()] = -1
+    signals[np.isnan(rti_v)] = -1
+
+    rti = pd.DataFrame(rti_v, index=volatility.index, columns=volatility.columns)
+    signals = pd.DataFrame(signals, index=volatility.index, columns=volatility.columns)
 
     # Slice off warm-up
     valid_start = length
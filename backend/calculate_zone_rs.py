@@ -102,8 +102,8 @@ def calculate_zone_rs(stock_prices, benchmark_prices, rs_length, momentum_length
 
     # Align dates (intersection)
     common_index = stock_prices.index.intersection(benchmark_prices.index)
-    stocks = stock_prices.loc[common_index].copy()
-    bench = benchmark_prices.loc[common_index].copy()
+    stocks = stock_prices.loc[common_index]
+    bench = benchmark_prices.loc[common_index]
 
     # If benchmark is a Series or single-column DataFrame, ensure it aligns for broadcasting
     if isinstance(bench, pd.DataFrame):
@@ -125,6 +125,8 @@ def calculate_zone_rs(stock_prices, benchmark_prices, rs_length, momentum_length
     rs_raw = stocks.div(bench_close, axis=0)
 
     # 2. RS SMA
+    # pandas rolling mean is exact over flat windows; a running-sum mean can land an ulp
+    # below the ratio's 1.0 threshold and flip the Zone.
     rs_sma = rs_raw.rolling(window=rs_length).mean()
 
     # 3. RS Ratio = RS / RS SMA
@@ -152,31 +154,18 @@ def calculate_zone_rs(stock_prices, benchmark_prices, rs_length, momentum_length
     # 3: Power (Green)
     # -1: Unknown/NaN
 
-    # Initialize with -1
-    zones = pd.DataFrame(-1, index=rs_ratio.index, columns=rs_ratio.columns)
-
-    # Masking for vectorized assignment
+    # Codes follow directly from the two quadrant bits: 2 * (Ratio >= 1) + (Mom >= 0)
     # Condition: Valid Data (not NaN)
-    valid_mask = rs_ratio.notna() & rs_momentum.notna()
-
-    ratio_ge_1 = rs_ratio >= 1.0
-    mom_ge_0   = rs_momentum >= 0.0
-
-    # Power: Ratio >= 1 & Mom >= 0
-    mask_power = valid_mask & ratio_ge_1 & mom_ge_0
-    zones[mask_power] = 3 # Power
-
-    # Drift: Ratio >= 1 & Mom < 0
-    mask_drift = valid_mask & ratio_ge_1 & (~mom_ge_0)
-    zones[mask_drift] = 2 # Drift
-
-    # Lift: Ratio < 1 & Mom >= 0
-    mask_lift = valid_mask & (~ratio_ge_1) & mom_ge_0
-    zones[mask_lift] = 1 # Lift
-
-    # Dead: Ratio < 1 & Mom < 0
-    mask_dead = valid_mask & (~ratio_ge_1) & (~mom_ge_0)
-    zones[mask_dead] = 0 # Dead
+    ratio_v = rs_ratio.to_numpy(dtype=float)
+    mom_v = rs_momentum.to_numpy(dtype=float)
+    valid_mask = ~np.isnan(ratio_v) & ~np.isnan(mom_v)
+
+    codes = 2 * (ratio_v >= 1.0) + (mom_v >= 0.0)
+    zones = pd.DataFrame(
+        np.where(valid_mask, codes, -1).astype(np.int64),
+        index=rs_ratio.index,
+        columns=rs_ratio.columns,
+    )
 
     # Drop initial NaN rows required for calculation
     valid_start_idx = max(rs_length, momentum_length)
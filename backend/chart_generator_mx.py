@@ -5,16 +5,39 @@ from backend.rdt_data_fetcher import RDTDataFetcher
 import os
 import numpy as np
 
+# Historical percentile bar colors: < 10, < 30, < 50, < 70, < 85, < 95, >= 95
+PERC_BINS = np.array([10, 30, 50, 70, 85, 95])
+PERC_COLORS = np.array(['#d86eef', '#d3eeff', '#4e7eff', '#96d7ff', '#80cfff', '#1eaaff', '#30b0ff'])
+
+# Chart style is identical for every ticker, so build it once.
+# Font size adjustment (approx 1.5x)
+# Default often ~10, so we target ~15.
+WEEKLY_CHART_STYLE = mpf.make_mpf_style(base_mpf_style='yahoo', rc={
+    'axes.grid': True,
+    'grid.linestyle': ':',
+    'font.size': 15,
+    'axes.titlesize': 18,
+    'axes.labelsize': 15,
+    'xtick.labelsize': 14,
+    'ytick.labelsize': 14,
+    'legend.fontsize': 14
+})
+
 class RDTChartGenerator:
-    def __init__(self):
+    def __init__(self, preloaded=None, data_folder="data"):
         self.fetcher = RDTDataFetcher()
-        self.data_folder = "data"
+        self.data_folder = data_folder
+        # Pickles are read once per generator instance and reused for every ticker.
+        # preloaded: {filename: data} already loaded by the caller (e.g. the screener).
+        self._pickle_cache = dict(preloaded) if preloaded else {}
 
     def load_pickle_data(self, filename):
+        if filename in self._pickle_cache:
+            return self._pickle_cache[filename]
         path = os.path.join(self.data_folder, filename)
-        if os.path.exists(path):
-            return pd.read_pickle(path)
-        return None
+        data = pd.read_pickle(path) if os.path.exists(path) else None
+        self._pickle_cache[filename] = data
+        return data
 
     def generate_chart(self, ticker, output_filename=None):
         print(f"Generating chart for {ticker}...")
@@ -74,11 +97,12 @@ class RDTChartGenerator:
         apds = []
 
         def add_plot_safe(data, **kwargs):
+            # Existence check only: notna().any() avoids materializing a dropna() copy
             if isinstance(data, pd.Series):
-                if data.dropna().empty:
+                if not data.notna().any():
                     return
             elif isinstance(data, pd.DataFrame):
-                if data.dropna(how='all').empty:
+                if not data.notna().any(axis=None):
                     return
             apds.append(mpf.make_addplot(data, **kwargs))
 
@@ -111,8 +135,8 @@ class RDTChartGenerator:
                 # Signals (Arrows)
                 # Buy = 1 (Green Arrow Up), Sell = -1 (Red Arrow Down)
                 # To place markers, we need arrays of same length as plot_df
-                buy_markers = signals.apply(lambda x: x if x == 1 else np.nan)
-                sell_markers = signals.apply(lambda x: x if x == -1 else np.nan)
+                buy_markers = signals.where(signals == 1)
+                sell_markers = signals.where(signals == -1)
 
                 # We need to set the value for the marker position.
                 # Usually slightly below Low for Buy, slightly above High for Sell.
@@ -198,16 +222,10 @@ class RDTChartGenerator:
         if rs_perc_data:
             try:
                 perc = rs_perc_data["Percentile_1M"][ticker].reindex(valid_idx)
-                colors = []
-                for v in perc:
-                    if pd.isna(v): colors.append('white')
-                    elif v < 10: colors.append('#d86eef')
-                    elif v < 30: colors.append('#d3eeff')
-                    elif v < 50: colors.append('#4e7eff')
-                    elif v < 70: colors.append('#96d7ff')
-                    elif v < 85: colors.append('#80cfff')
-                    elif v < 95: colors.append('#1eaaff')
-                    else: colors.append('#30b0ff')
+                # Bucket all values at once: bin i covers [PERC_BINS[i-1], PERC_BINS[i])
+                perc_v = perc.to_numpy(dtype=float)
+                color_idx = np.digitize(perc_v, PERC_BINS)
+                colors = np.where(np.isnan(perc_v), 'white', PERC_COLORS[color_idx]).tolist()
 
                 add_plot_safe(perc, type='bar', panel=3, color=colors, ylabel='Hist %')
 
@@ -220,8 +238,8 @@ class RDTChartGenerator:
                 rs_val = rs_vol_data["RS_Values"][ticker].reindex(valid_idx)
                 rs_ma = rs_vol_data["RS_MA"][ticker].reindex(valid_idx)
 
-                rs_pos = rs_val.apply(lambda x: x if x >= 0 else np.nan)
-                rs_neg = rs_val.apply(lambda x: x if x <= 0 else np.nan)
+                rs_pos = rs_val.where(rs_val >= 0)
+                rs_neg = rs_val.where(rs_val <= 0)
 
                 add_plot_safe(rs_pos, panel=4, color='blue', width=1.5, ylabel='Vol Adj RS')
                 add_plot_safe(rs_neg, panel=4, color='fuchsia', width=1.5)
@@ -340,24 +358,10 @@ class RDTChartGenerator:
         if output_filename is None:
             output_filename = f"{ticker}_weekly_chart.png"
 
-        # Font size adjustment (approx 1.5x)
-        # Default often ~10, so we target ~15.
-        rc_params = {
-            'axes.grid': True,
-            'grid.linestyle': ':',
-            'font.size': 15,
-            'axes.titlesize': 18,
-            'axes.labelsize': 15,
-            'xtick.labelsize': 14,
-            'ytick.labelsize': 14,
-            'legend.fontsize': 14
-        }
-        s = mpf.make_mpf_style(base_mpf_style='yahoo', rc=rc_params)
-
         fig, axes = mpf.plot(
             plot_df,
             type='candle',
-            style=s,
+            style=WEEKLY_CHART_STYLE,
             addplot=apds,
             volume=True,
             volume_panel=1,
@@ -3,8 +3,9 @@ import os
 import sys
 import datetime
 import logging
+from collections import Counter
 from pywebpush import webpush, WebPushException
-from backend.screener_service import run_screener_process
+from backend.screener_service import run_screener_process, write_json_atomic
 from backend.security_manager import security_manager
 # Market Analysis Imports
 from backend.market_analysis_logic import get_market_analysis_data
@@ -104,9 +105,11 @@ def send_push_notifications(daily_data):
             logger.error(f"Error saving subscriptions after cleanup: {e}")
 
     # Log detailed stats matching HanaView style
-    standard_count = sum(1 for s in subscriptions.values() if s.get('permission', 'standard') == 'standard')
-    secret_count = sum(1 for s in subscriptions.values() if s.get('permission') == 'secret')
-    ura_count = sum(1 for s in subscriptions.values() if s.get('permission') == 'ura')
+    # One pass over subscriptions instead of one per permission level
+    permission_counts = Counter(s.get('permission', 'standard') for s in subscriptions.values())
+    standard_count = permission_counts['standard']
+    secret_count = permission_counts['secret']
+    ura_count = permission_counts['ura']
 
     logger.info(f"Push notifications sent: {sent_count} | Standard: {standard_count}, Secret: {secret_count}, Ura: {ura_count}")
 
@@ -131,59 +134,19 @@ def fetch_and_notify():
 
             # Save market analysis (History)
             analysis_file = os.path.join(DATA_DIR, "market_analysis.json")
-            with open(analysis_file, "w") as f:
-                json.dump({
-                    "history": market_data,
-                    "last_updated": datetime.datetime.now().isoformat()
-                }, f)
+            write_json_atomic(analysis_file, {
+                "history": market_data,
+                "last_updated": datetime.datetime.now().isoformat()
+            })
             logger.info(f"Saved {analysis_file}")
         else:
             logger.error("Failed to generate market data.")
 
         # 2. Legacy MomentumX data plus Recognition Gap EP ranking
-        daily_data = run_screener_process()
-
-        # Merge Market Status into daily_data if available
-        if daily_data and market_data:
-            latest_market = market_data[-1]
-            daily_data['market_status'] = latest_market['market_status']
-            daily_data['status_text'] = latest_market['status_text'] # Overwrite "Screened: N" or append?
-            # User wants "Market Analysis is formerly displayed". The frontend uses 'status_text' for the badge.
-            # screener_service sets status_text to "Screened: N".
-            # We should probably combine them or prioritize Market Status.
-            # Frontend app.js uses status_text for badge color (Green/Red).
-            # So we should use the Market Status text.
-
-            # Update the JSON files saved by screener_service?
-            # screener_service saves json inside run_screener_process.
-            # We might need to update those files or modify run_screener_process to accept status.
-            # For now, let's update daily_data here and re-save if we want consistency,
-            # BUT screener_service already wrote to disk.
-
-            # Re-writing the daily JSONs to include Market Status
-            # Use date from daily_data to find the correct file
-            today_str = daily_data.get('date', '').replace('-', '')
-            if not today_str:
-                today_str = datetime.datetime.now().strftime('%Y%m%d')
-
-            json_path = os.path.join(DATA_DIR, f"{today_str}.json")
-            latest_path = os.path.join(DATA_DIR, "latest.json")
-
-            if os.path.exists(json_path):
-                with open(json_path, 'r') as f:
-                    saved_data = json.load(f)
-                saved_data['market_status'] = latest_market['market_status']
-                saved_data['status_text'] = latest_market['status_text']
-                with open(json_path, 'w') as f:
-                    json.dump(saved_data, f)
-
-            if os.path.exists(latest_path):
-                with open(latest_path, 'w') as f:
-                    json.dump(saved_data, f) # Save updated data
-
-            # Update local var for notification
-            daily_data['market_status'] = latest_market['market_status']
-            daily_data['status_text'] = latest_market['status_text']
+        # The latest Market Status goes straight into the daily JSON (the frontend badge uses
+        # status_text), so screener_service writes {date}.json / latest.json only once.
+        latest_market = market_data[-1] if market_data else None
+        daily_data = run_screener_process(market_summary=latest_market)
 
         if daily_data:
             send_push_notifications(daily_data)
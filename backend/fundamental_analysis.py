@@ -1,12 +1,17 @@
 import yfinance as yf
 import pandas as pd
 import numpy as np
+import os
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Lookups are network-bound, so several run at once; requests still start `delay` apart.
+FUNDAMENTAL_WORKERS = int(os.getenv("FUNDAMENTAL_WORKERS", "4"))
+
 def get_growth_rate(current, previous):
     if previous == 0 or pd.isna(previous) or pd.isna(current):
         return np.nan
@@ -233,16 +238,17 @@ def analyze_ticker(symbol):
 def analyze_tickers_in_batch(tickers, delay=1.0):
     """
     Analyzes a list of tickers with a delay to respect API limits.
+    Tickers are started `delay` seconds apart but their requests overlap on a thread pool.
     Returns a dictionary: { symbol: result_dict }
     """
-    results = {}
     total = len(tickers)
     logger.info(f"Starting fundamental analysis for {total} tickers...")
 
-    for i, symbol in enumerate(tickers):
-        logger.info(f"Analyzing {symbol} ({i+1}/{total})")
-        res = analyze_ticker(symbol)
-        results[symbol] = res
-        time.sleep(delay)
+    futures = {}
+    with ThreadPoolExecutor(max_workers=max(1, FUNDAMENTAL_WORKERS)) as pool:
+        for i, symbol in enumerate(tickers):
+            logger.info(f"Analyzing {symbol} ({i+1}/{total})")
+            futures[symbol] = pool.submit(analyze_ticker, symbol)
+            time.sleep(delay)
 
-    return results
+    return {symbol: future.result() for symbol, future in futures.items()}
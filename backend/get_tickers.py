@@ -2,6 +2,7 @@ import os
 import pandas as pd
 from typing import List, Dict, Optional
 import time
+from collections import deque
 from curl_cffi.requests import Session
 from dotenv import load_dotenv
 import logging
@@ -36,22 +37,27 @@ class FMPTickerFetcher:
         # Rate limit settings (default 750 req/min for Premium Plan)
         self.rate_limit = rate_limit or int(os.getenv('FMP_RATE_LIMIT', '750'))
         self.session = Session(impersonate="chrome110")
-        self.request_timestamps = []
+        self.request_timestamps = deque()
+
+    def _expire_timestamps(self, current_time: float):
+        """Pop request timestamps that have left the 60 second window."""
+        while self.request_timestamps and current_time - self.request_timestamps[0] >= 60:
+            self.request_timestamps.popleft()
 
     def _enforce_rate_limit(self):
         """Enforce the configured API rate limit per minute."""
         current_time = time.time()
-        # Remove timestamps older than 60 seconds
-        self.request_timestamps = [t for t in self.request_timestamps if current_time - t < 60]
+        # Timestamps are appended in order, so only the head can have expired
+        self._expire_timestamps(current_time)
 
         if len(self.request_timestamps) >= self.rate_limit:
             # Sleep until the oldest request is older than 60 seconds
             sleep_time = 60 - (current_time - self.request_timestamps[0]) + 0.1
             logger.info(f"Rate limit reached. Sleeping for {sleep_time:.1f} seconds...")
             time.sleep(sleep_time)
-            # Trim the list again after sleeping
+            # Trim the window again after sleeping
             current_time = time.time()
-            self.request_timestamps = [t for t in self.request_timestamps if current_time - t < 60]
+            self._expire_timestamps(current_time)
 
         self.request_timestamps.append(current_time)
 
@@ -1,7 +1,10 @@
 import pandas as pd
 import pandas_ta as ta
 import numpy as np
+import bottleneck as bn
+from numpy.lib.stride_tricks import sliding_window_view
 import yfinance as yf
+from scipy.signal import lfilter
 import datetime
 import logging
 
@@ -9,42 +12,90 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Market status lookup tables, indexed by code 0=Green, 1=Neutral, 2=Red.
+# Text is indexed by current_code * 3 + previous_code.
+STATUS_TEXT_TABLE = np.array([
+    "still Green", "Start Green", "Red to Green",
+    "Neutral", "Neutral", "Neutral",
+    "Green to Red", "Start Red", "still Red",
+])
+STATUS_COLOR_TABLE = np.array(["Green", "Gray", "Red"])
+
 def calculate_wma(series, length):
-    """Calculates Weighted Moving Average (WMA)."""
-    weights = np.arange(1, length + 1)
-    sum_weights = weights.sum()
-    return series.rolling(window=length).apply(lambda x: np.dot(x, weights) / sum_weights, raw=True)
+    """
+    Calculates Weighted Moving Average (WMA).
+    One matrix-vector product over a strided window view; windows containing NaN
+    stay NaN, as with rolling().apply().
+    """
+    values = series.to_numpy(dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if len(values) >= length:
+        weights = np.arange(1, length + 1, dtype=np.float64)
+        weights /= weights.sum()
+        windows = sliding_window_view(values, length)
+        wma = windows @ weights
+        wma[np.isnan(windows).any(axis=1)] = np.nan
+        out[length - 1:] = wma
+    return pd.Series(out, index=series.index)
+
+def calculate_ema(values, span):
+    """
+    EMA matching ewm(span=span, adjust=False).mean(), as a first-order IIR filter.
+    Leading NaNs stay NaN; the recursion is seeded with the first valid value.
+    """
+    out = np.full(values.shape, np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) == 0:
+        return out
+    first = valid[0]
+    tail = values[first:]
+    if np.isnan(tail).any():
+        # Interior gaps need pandas' NaN-aware weighting
+        return pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+    alpha = 2.0 / (span + 1.0)
+    out[first:], _ = lfilter([alpha], [1.0, alpha - 1.0], tail, zi=[(1.0 - alpha) * tail[0]])
+    return out
 
 def calculate_tsv_approximation(df, length=13, ma_length=7, ma_type='EMA'):
     """
     Calculates Time Segmented Volume (TSV) approximation.
     """
-    price_change = df['Close'].diff()
-    signed_volume = df['Volume'] * price_change
-    tsv_raw = signed_volume.rolling(window=length).sum()
+    close = df['Close'].to_numpy(dtype=np.float64)
+    volume = df['Volume'].to_numpy(dtype=np.float64)
+    signed_volume = volume * np.diff(close, prepend=np.nan)
+    # bottleneck rejects windows longer than the input; such a series is all warm-up anyway
+    if len(signed_volume) >= length:
+        tsv_raw = bn.move_sum(signed_volume, window=length, min_count=length)
+    else:
+        tsv_raw = np.full(len(signed_volume), np.nan)
 
     if ma_type == 'EMA':
-        tsv_smoothed = tsv_raw.ewm(span=ma_length, adjust=False).mean()
-    elif ma_type == 'SMA':
-        tsv_smoothed = tsv_raw.rolling(window=ma_length).mean()
+        tsv_smoothed = calculate_ema(tsv_raw, ma_length)
+    elif len(tsv_raw) >= ma_length:
+        tsv_smoothed = bn.move_mean(tsv_raw, window=ma_length, min_count=ma_length)
     else:
-        tsv_smoothed = tsv_raw.rolling(window=ma_length).mean()
+        tsv_smoothed = np.full(len(tsv_raw), np.nan)
 
-    return tsv_smoothed
+    return pd.Series(tsv_smoothed, index=df.index)
 
 def calculate_stochrsi_1op(df, rsi_length=14, stoch_length=14, k_smooth=5, d_smooth=5):
     """
     Calculates StochRSI with HEAVIER WMA smoothing (5, 5) to mimic 1OP cycles.
     """
     rsi = ta.rsi(df['Close'], length=rsi_length)
-    rsi_low = rsi.rolling(window=stoch_length).min()
-    rsi_high = rsi.rolling(window=stoch_length).max()
+    rsi_values = rsi.to_numpy(dtype=np.float64)
+    if len(rsi_values) >= stoch_length:
+        rsi_low = bn.move_min(rsi_values, window=stoch_length, min_count=stoch_length)
+        rsi_high = bn.move_max(rsi_values, window=stoch_length, min_count=stoch_length)
+    else:
+        rsi_low = rsi_high = np.full(len(rsi_values), np.nan)
 
+    # Flat RSI windows (zero range) and warm-up bars read as the neutral 50
     denominator = rsi_high - rsi_low
-    denominator = denominator.replace(0, np.nan)
-
-    stoch_raw = ((rsi - rsi_low) / denominator) * 100
-    stoch_raw = stoch_raw.fillna(50)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stoch_raw = np.where(denominator > 0, ((rsi_values - rsi_low) / denominator) * 100, np.nan)
+    np.nan_to_num(stoch_raw, copy=False, nan=50.0)
+    stoch_raw = pd.Series(stoch_raw, index=rsi.index)
 
     k_line = calculate_wma(stoch_raw, k_smooth)
     d_line = calculate_wma(k_line, d_smooth)
@@ -58,29 +109,23 @@ def detect_cycle_phases(df):
     if 'Fast_K' not in df.columns or 'Slow_D' not in df.columns:
         return None, None
 
-    k = df['Fast_K'].values
-    d = df['Slow_D'].values
-
-    bullish_phase = np.zeros(len(df), dtype=bool)
-    bearish_phase = np.zeros(len(df), dtype=bool)
+    k = df['Fast_K'].to_numpy(dtype=np.float64)
+    d = df['Slow_D'].to_numpy(dtype=np.float64)
 
-    # State: 0 = Neutral/Unknown, 1 = Bullish, -1 = Bearish
-    state = 0
+    # Crosses between consecutive bars; the first bar has no previous bar and never starts a phase
+    cross_up = (k[:-1] <= d[:-1]) & (k[1:] > d[1:])
+    cross_down = (k[:-1] >= d[:-1]) & (k[1:] < d[1:])
 
-    for i in range(1, len(df)):
-        # Check Crosses
-        cross_up = (k[i-1] <= d[i-1]) and (k[i] > d[i])
-        cross_down = (k[i-1] >= d[i-1]) and (k[i] < d[i])
+    # State: 0 = Neutral/Unknown, 1 = Bullish, -1 = Bearish.
+    # It only changes on a cross and otherwise persists, so forward-fill the cross events
+    # by carrying the index of the last event forward (bar 0 never has one and stays Neutral).
+    events = np.zeros(len(df), dtype=np.int8)
+    events[1:] = np.where(cross_up, 1, np.where(cross_down, -1, 0))
+    last_event = np.maximum.accumulate(np.where(events != 0, np.arange(len(events)), 0))
+    state = events[last_event]
 
-        if cross_up:
-            state = 1
-        elif cross_down:
-            state = -1
-
-        if state == 1:
-            bullish_phase[i] = True
-        elif state == -1:
-            bearish_phase[i] = True
+    bullish_phase = state == 1
+    bearish_phase = state == -1
 
     return bullish_phase, bearish_phase
 
@@ -90,104 +135,68 @@ def get_market_analysis_data(ticker="SPY", period="6mo"):
     Returns: (list_of_dicts, spy_dataframe)
     """
     try:
-        # Use simple download.
-        df = yf.download(ticker, period=period, interval="1d", progress=False)
+        # Single ticker: ask yfinance for flat (Price) columns instead of flattening (Price, Ticker) afterwards
+        df = yf.download(ticker, period=period, interval="1d", progress=False, auto_adjust=True, multi_level_index=False)
         if df.empty:
             logger.error("Market data download failed")
             return [], pd.DataFrame()
 
-        # Handle MultiIndex columns (Price, Ticker) -> Flatten to just Price
-        if isinstance(df.columns, pd.MultiIndex):
-            try:
-                df.columns = df.columns.droplevel('Ticker')
-            except KeyError:
-                if df.columns.nlevels > 1:
-                     df.columns = df.columns.droplevel(1)
-
         # Ensure Index is tz-naive
         if df.index.tz is not None:
             df.index = df.index.tz_localize(None)
 
         df.columns = [c.capitalize() for c in df.columns]
 
-        # Indicators
-        df['TSV'] = calculate_tsv_approximation(df, length=12, ma_length=7, ma_type='EMA')
-        df['Fast_K'], df['Slow_D'] = calculate_stochrsi_1op(df, rsi_length=14, stoch_length=14, k_smooth=5, d_smooth=5)
+        # Indicators (new columns are added with one assign per stage rather than one insert each)
+        fast_k, slow_d = calculate_stochrsi_1op(df, rsi_length=14, stoch_length=14, k_smooth=5, d_smooth=5)
+        df = df.assign(
+            TSV=calculate_tsv_approximation(df, length=12, ma_length=7, ma_type='EMA'),
+            Fast_K=fast_k,
+            Slow_D=slow_d,
+        )
 
         # Phases
         bull_mask, bear_mask = detect_cycle_phases(df)
-        df['Bullish_Phase'] = bull_mask
-        df['Bearish_Phase'] = bear_mask
 
         # Generate Trend Signal for Chart Generator (1: Bull, -1: Bear, 0: Neutral)
         # The legacy logic uses statuses like "Green", "Red", "Neutral".
         # Chart generator expects 'Trend_Signal' column with 1, -1, 0.
-        conditions = [df['Bullish_Phase'] == True, df['Bearish_Phase'] == True]
-        choices = [1, -1]
-        df['Trend_Signal'] = np.select(conditions, choices, default=0)
-
-        results = []
-        for i in range(len(df)):
-            date = df.index[i]
-            date_key = date.strftime('%Y%m%d')
-            date_str = date.strftime('%Y/%-m/%-d')
-
-            is_bull = bool(df['Bullish_Phase'].iloc[i])
-            is_bear = bool(df['Bearish_Phase'].iloc[i])
-
-            current_status = "Green" if is_bull else ("Red" if is_bear else "Neutral")
-
-            if i > 0:
-                prev_bull = bool(df['Bullish_Phase'].iloc[i-1])
-                prev_bear = bool(df['Bearish_Phase'].iloc[i-1])
-                prev_status = "Green" if prev_bull else ("Red" if prev_bear else "Neutral")
-            else:
-                prev_status = "Neutral"
-
-            status_text = ""
-            status_color = "Green" # Default?
-
-            # Replicate legacy text logic
-            if current_status == "Green":
-                status_color = "Green"
-                if prev_status == "Red":
-                    status_text = "Red to Green"
-                elif prev_status == "Green":
-                    status_text = "still Green"
-                else:
-                    status_text = "Start Green"
-            elif current_status == "Red":
-                status_color = "Red"
-                if prev_status == "Green":
-                    status_text = "Green to Red"
-                elif prev_status == "Red":
-                    status_text = "still Red"
-                else:
-                    status_text = "Start Red"
-            else:
-                status_text = "Neutral"
-                status_color = "Gray"
-
-            # Map legacy status color to frontend expectations if needed
-            # Frontend uses status_text for badge color logic:
-            # includes "Red to" -> Green badge (bullish reversal)
-            # includes "Green to" -> Red badge (bearish reversal)
-            # includes "Green" -> Green
-            # includes "Red" -> Red
-
-            results.append({
-                "date_key": date_key,
-                "date": date_str,
-                "open": float(df['Open'].iloc[i]),
-                "high": float(df['High'].iloc[i]),
-                "low": float(df['Low'].iloc[i]),
-                "close": float(df['Close'].iloc[i]),
-                "tsv": float(df['TSV'].iloc[i]) if not pd.isna(df['TSV'].iloc[i]) else None,
-                "fast_k": float(df['Fast_K'].iloc[i]) if not pd.isna(df['Fast_K'].iloc[i]) else None,
-                "slow_d": float(df['Slow_D'].iloc[i]) if not pd.isna(df['Slow_D'].iloc[i]) else None,
-                "market_status": status_color, # Legacy field
-                "status_text": status_text
-            })
+        trend = np.select([bull_mask, bear_mask], [1, -1], default=0)
+        df = df.assign(Bullish_Phase=bull_mask, Bearish_Phase=bear_mask, Trend_Signal=trend)
+
+        # Replicate legacy text logic for the whole history at once:
+        # encode Trend_Signal (1/0/-1) as 0=Green, 1=Neutral, 2=Red and gather from (current, previous) tables
+        cur_code = 1 - trend
+        prev_code = np.concatenate(([1], cur_code[:-1]))
+        status_texts = STATUS_TEXT_TABLE[cur_code * 3 + prev_code]
+        status_colors = STATUS_COLOR_TABLE[cur_code]
+
+        # Map legacy status color to frontend expectations if needed
+        # Frontend uses status_text for badge color logic:
+        # includes "Red to" -> Green badge (bullish reversal)
+        # includes "Green to" -> Red badge (bearish reversal)
+        # includes "Green" -> Green
+        # includes "Red" -> Red
+
+        # Assemble the records from whole-column lists; indicator warm-up NaNs become None (null in JSON)
+        def _nullable(col):
+            return [None if v != v else v for v in df[col].to_numpy(dtype=float).tolist()]
+
+        keys = ("date_key", "date", "open", "high", "low", "close", "tsv", "fast_k", "slow_d", "market_status", "status_text")
+        columns = (
+            df.index.strftime('%Y%m%d').tolist(),
+            df.index.strftime('%Y/%-m/%-d').tolist(),
+            df['Open'].to_numpy(dtype=float).tolist(),
+            df['High'].to_numpy(dtype=float).tolist(),
+            df['Low'].to_numpy(dtype=float).tolist(),
+            df['Close'].to_numpy(dtype=float).tolist(),
+            _nullable('TSV'),
+            _nullable('Fast_K'),
+            _nullable('Slow_D'),
+            status_colors.tolist(), # Legacy field
+            status_texts.tolist(),
+        )
+        results = [dict(zip(keys, row)) for row in zip(*columns)]
 
         return results, df
 
@@ -8,6 +8,16 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Style (built once at import; it never changes between calls)
+MARKET_CHART_STYLE = mpf.make_mpf_style(
+    marketcolors=mpf.make_marketcolors(up='green', down='red', inherit=True),
+    gridstyle=':',
+    y_on_right=True,
+)
+
+# Above this many daily bars the chart is resampled to weekly before plotting
+MAX_DAILY_BARS = 500
+
 def generate_market_chart(df, output_path):
     """
     Generates the Market Analysis chart (SPY) with trend background colors.
@@ -23,6 +33,15 @@ def generate_market_chart(df, output_path):
         else:
             df.index = pd.to_datetime(df.index)
 
+    # Level of detail: at 10x13in / 100dpi, thousands of daily candles cost render time without
+    # adding visible detail, so long histories are drawn as weekly bars.
+    if len(df) > MAX_DAILY_BARS:
+        agg = {col: 'last' for col in df.columns}
+        agg.update({'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last'})
+        if 'Volume' in agg:
+            agg['Volume'] = 'sum'
+        df = df.resample('W-FRI').agg(agg).dropna(subset=['Open', 'High', 'Low', 'Close'])
+
     # Prepare AddPlots
     apds = []
 
@@ -57,35 +76,28 @@ def generate_market_chart(df, output_path):
         y_high = df['High'].max() * 1.05
         y_low = df['Low'].min() * 0.95
 
-        # Bullish (Green Signal) -> Cyan/SkyBlue background
+        # Both backgrounds ride on one invisible carrier line (fill_between accepts a list of dicts),
+        # so the main panel gets a single hidden Line2D instead of two. Each fill is drawn only over
+        # its contiguous signal runs, exactly as with separate addplots.
         apds.append(mpf.make_addplot(
             np.full(len(df), y_high),
             panel=0,
             color='g',
             alpha=0.0,
             secondary_y=False,
-            fill_between=dict(y1=y_high, y2=y_low, where=signal.values==1, color='skyblue', alpha=0.15)
+            fill_between=[
+                # Bullish (Green Signal) -> Cyan/SkyBlue background
+                dict(y1=y_high, y2=y_low, where=signal.values==1, color='skyblue', alpha=0.15),
+                # Bearish (Red Signal) -> Red background
+                dict(y1=y_high, y2=y_low, where=signal.values==-1, color='red', alpha=0.15),
+            ]
         ))
 
-        # Bearish (Red Signal) -> Red background
-        apds.append(mpf.make_addplot(
-            np.full(len(df), y_high),
-            panel=0,
-            color='r',
-            alpha=0.0,
-            secondary_y=False,
-            fill_between=dict(y1=y_high, y2=y_low, where=signal.values==-1, color='red', alpha=0.15)
-        ))
-
-    # Style
-    mc = mpf.make_marketcolors(up='green', down='red', inherit=True)
-    s = mpf.make_mpf_style(marketcolors=mc, gridstyle=':', y_on_right=True)
-
     try:
         fig, axlist = mpf.plot(
             df,
             type='candle',
-            style=s,
+            style=MARKET_CHART_STYLE,
             addplot=apds,
             volume=False, # Volume usually not on SPY analysis chart or simplified
             panel_ratios=(6, 1, 1),
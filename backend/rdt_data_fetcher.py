@@ -4,6 +4,7 @@ Yahoo Financeから株価データ(OHLCV)を取得して保存するスクリプ
 """
 import os
 import glob
+import shutil
 import pandas as pd
 import yfinance as yf
 from datetime import datetime, timedelta
@@ -62,8 +63,8 @@ def load_existing_price_data():
         logging.info(f"Symbols: {len(price_data.columns.get_level_values(1).unique())}")
         logging.info(f"Days of data: {len(price_data)}")
 
-        # バックアップを作成
-        price_data.to_pickle(BACKUP_PATH)
+        # バックアップを作成（読み込み済みのpickleを再シリアライズせず、ファイルをそのままコピー）
+        shutil.copyfile(PRICE_DATA_PATH, BACKUP_PATH)
         logging.info(f"✓ Backup created: {BACKUP_PATH}")
         logging.info(f"{'='*60}\n")
 
@@ -96,8 +97,8 @@ def get_unique_symbols(symbol_limit=None, override_start_date=None):
                 df = df.rename(columns={'Ticker': 'Symbol'})
 
             if 'Symbol' in df.columns:
-                all_symbols = df['Symbol'].dropna().unique().tolist()
-                unique_symbols = sorted(list(set(all_symbols)))
+                # unique() already deduplicates; sorted() consumes the array directly
+                unique_symbols = sorted(df['Symbol'].dropna().unique())
                 logging.info(f"Found {len(unique_symbols)} unique symbols from stock.csv.")
 
                 # Determine start date logic
@@ -135,8 +136,8 @@ def get_unique_symbols(symbol_limit=None, override_start_date=None):
 
             # Extract symbols from the CSV
             if 'Symbol' in df.columns:
-                all_symbols = df['Symbol'].dropna().unique().tolist()
-                unique_symbols = sorted(list(set(all_symbols)))
+                # unique() already deduplicates; sorted() consumes the array directly
+                unique_symbols = sorted(df['Symbol'].dropna().unique())
                 logging.info(f"Found {len(unique_symbols)} unique symbols from target_stocks CSV.")
 
                 # 開始日の決定優先順位: override_start_date > START_DATE > デフォルト（6ヶ月前）
@@ -163,7 +164,7 @@ def get_unique_symbols(symbol_limit=None, override_start_date=None):
         logging.info("No target_stocks CSV found. Falling back to Excel files.")
 
     # Fallback to original Excel-based logic
-    all_symbols = []
+    all_symbols = set()
     excel_files = glob.glob(os.path.join(DATA_FOLDER, "integrated_screening_*.xlsx"))
     if not excel_files:
         excel_files = glob.glob(os.path.join(DATA_FOLDER, "stock_screening_*.xlsx"))
@@ -202,11 +203,11 @@ def get_unique_symbols(symbol_limit=None, override_start_date=None):
     for file_path in excel_files:
         try:
             df = pd.read_excel(file_path, sheet_name='Screening_Results', usecols=['Symbol'])
-            all_symbols.extend(df['Symbol'].dropna().unique())
+            all_symbols.update(df['Symbol'].dropna().unique())
         except Exception as e:
             logging.error(f"Error reading {file_path}: {e}")
 
-    unique_symbols = sorted(list(set(all_symbols)))
+    unique_symbols = sorted(all_symbols)
     logging.info(f"Found a total of {len(unique_symbols)} unique symbols.")
 
     if symbol_limit is not None and symbol_limit > 0:
@@ -236,6 +237,7 @@ def download_price_data(symbols, start_date, end_date=None, chunk_size=50, delay
     logging.info(f"{'='*60}\n")
 
     all_data = []
+    checkpointed = 0  # all_data[:checkpointed] は一時ファイルに保存済み
     failed_symbols = []
     total_chunks = (len(symbols) + chunk_size - 1) // chunk_size
 
@@ -278,10 +280,12 @@ def download_price_data(symbols, start_date, end_date=None, chunk_size=50, delay
         if not success:
             failed_symbols.extend(chunk)
 
-        if chunk_num % 20 == 0 and all_data:
-            temp_df = pd.concat(all_data, axis=1)
+        if chunk_num % 20 == 0 and len(all_data) > checkpointed:
+            # 前回の保存以降のチャンクだけを書き出す（毎回全体をconcatすると保存コストが二乗で増える）
+            temp_df = pd.concat(all_data[checkpointed:], axis=1)
             temp_path = os.path.join(DATA_FOLDER, f"temp_price_data_chunk_{chunk_num}.pkl")
             temp_df.to_pickle(temp_path)
+            checkpointed = len(all_data)
             logging.info(f"💾 Progress saved: {temp_path}")
 
         time.sleep(delay)
@@ -295,7 +299,8 @@ def download_price_data(symbols, start_date, end_date=None, chunk_size=50, delay
         return None
 
     logging.info("\n✓ Merging chunks...")
-    return pd.concat(all_data, axis=1)
+    # 列MultiIndexを(Price, Ticker)順にソートしておくと、df['Close'][ticker]等の参照が二分探索になる
+    return pd.concat(all_data, axis=1).sort_index(axis=1)
 
 
 def merge_price_data(existing_data, new_data):
@@ -328,13 +333,9 @@ def merge_price_data(existing_data, new_data):
     # ステップ1: 既存銘柄のデータを更新（行方向で結合）
     if common_symbols:
         # 既存銘柄のみのデータを抽出
-        common_cols_existing = [col for col in existing_data.columns
-                               if col[1] in common_symbols]
-        common_cols_new = [col for col in new_data.columns
-                          if col[1] in common_symbols]
-
-        existing_common = existing_data[common_cols_existing]
-        new_common = new_data[common_cols_new]
+        # 列MultiIndexのシンボル階層に対するisinマスクで一括抽出（列ごとのPythonループを回避）
+        existing_common = existing_data.loc[:, existing_data.columns.get_level_values(1).isin(common_symbols)]
+        new_common = new_data.loc[:, new_data.columns.get_level_values(1).isin(common_symbols)]
 
         # 行方向で結合（日付軸）
         updated_common = pd.concat([existing_common, new_common], axis=0)
@@ -350,17 +351,13 @@ def merge_price_data(existing_data, new_data):
     removed_symbols = existing_symbols - new_symbols_all
     if removed_symbols:
         logging.info(f"⚠ Symbols no longer in screening: {len(removed_symbols)}")
-        removed_cols = [col for col in existing_data.columns
-                       if col[1] in removed_symbols]
-        kept_removed = existing_data[removed_cols]
+        kept_removed = existing_data.loc[:, existing_data.columns.get_level_values(1).isin(removed_symbols)]
     else:
         kept_removed = None
 
     # ステップ3: 新規銘柄を追加
     if added_symbols:
-        added_cols = [col for col in new_data.columns
-                     if col[1] in added_symbols]
-        added_data = new_data[added_cols]
+        added_data = new_data.loc[:, new_data.columns.get_level_values(1).isin(added_symbols)]
         logging.info(f"✓ Added new symbols: {added_data.shape}")
     else:
         added_data = None
@@ -382,7 +379,8 @@ def merge_price_data(existing_data, new_data):
     merged = pd.concat(parts_to_merge, axis=1)
     # 欠損値を前方埋め（新規銘柄の過去データは存在しないため）
     # merged = merged.fillna(method='ffill')  # 不要：NaNのままでOK
-    merged = merged.sort_index()
+    # 行は日付順、列は(Price, Ticker)の辞書順にソート（下流のラベル参照を高速化）
+    merged = merged.sort_index().sort_index(axis=1)
 
     logging.info(f"✓ Final merged: {merged.shape}")
     logging.info(f"  Date range: {merged.index.min().date()} to {merged.index.max().date()}")
@@ -553,7 +551,6 @@ if __name__ == "__main__":
     else:
         logging.error("Failed")
         if os.path.exists(BACKUP_PATH):
-            import shutil
             shutil.copy(BACKUP_PATH, PRICE_DATA_PATH)
             logging.info("✓ Restored from backup")
         exit(1)
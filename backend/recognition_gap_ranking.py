@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
 import logging
 import math
 import os
 import re
-from dataclasses import asdict, dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -21,6 +24,17 @@ try:
 except Exception:  # pragma: no cover - optional acceleration
     njit = None
 
+try:
+    import bottleneck as bn
+except Exception:  # pragma: no cover - optional acceleration
+    bn = None
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except Exception:  # pragma: no cover - enrichment is skipped without it
+    requests = None
+
 
 load_dotenv()
 
@@ -57,6 +71,8 @@ MAX_ESTIMATE_FETCH = int(os.getenv("RECOGNITION_GAP_ESTIMATE_FETCH_LIMIT", "150"
 NEWS_PRE_SIGNAL_DAYS = int(os.getenv("RECOGNITION_GAP_NEWS_PRE_SIGNAL_DAYS", "60"))
 NEWS_RECENT_DAYS = int(os.getenv("RECOGNITION_GAP_NEWS_RECENT_DAYS", "14"))
 NEWS_LIMIT_PER_SYMBOL = int(os.getenv("RECOGNITION_GAP_NEWS_LIMIT_PER_SYMBOL", "100"))
+HTTP_POOL_SIZE = int(os.getenv("RECOGNITION_GAP_HTTP_POOL_SIZE", "16"))
+PROFILE_FETCH_WORKERS = max(1, int(os.getenv("RECOGNITION_GAP_PROFILE_FETCH_WORKERS", "4")))
 
 BIOTECH_TERMS = (
     "biotechnology",
@@ -187,6 +203,29 @@ class RecognitionGapRow:
     atr14_pct: float
 
 
+_ROW_FIELDS = tuple(f.name for f in fields(RecognitionGapRow))
+
+
+def _row_to_dict(row: RecognitionGapRow) -> dict[str, Any]:
+    # Shallow field copy: asdict() deep-copies every value recursively, which the JSON/CSV output does not need.
+    return {name: getattr(row, name) for name in _ROW_FIELDS}
+
+
+_HTTP_SESSION = None
+
+
+def _http_session():
+    """Return a shared keep-alive session so FMP calls reuse TCP/TLS connections."""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _HTTP_SESSION = session
+    return _HTTP_SESSION
+
+
 def _safe_float(value: Any, default: float = math.nan) -> float:
     try:
         if value is None or value == "":
@@ -230,7 +269,12 @@ def _load_price_data(path: Path = PRICE_DATA_PATH) -> pd.DataFrame:
 def _field(data: pd.DataFrame, field: str) -> pd.DataFrame:
     if field not in data.columns.get_level_values(0):
         return pd.DataFrame(index=data.index)
-    return data[field].copy()
+    frame = data[field].copy()
+    # Coerce the whole field once so per-symbol access in the ranking loop is a plain column lookup.
+    non_numeric = [col for col, dtype in frame.dtypes.items() if not pd.api.types.is_numeric_dtype(dtype)]
+    if non_numeric:
+        frame[non_numeric] = frame[non_numeric].apply(pd.to_numeric, errors="coerce")
+    return frame
 
 
 def _load_stock_csv_profiles() -> dict[str, dict[str, Any]]:
@@ -244,7 +288,8 @@ def _load_stock_csv_profiles() -> dict[str, dict[str, Any]]:
     if "Ticker" in df.columns and "Symbol" not in df.columns:
         df = df.rename(columns={"Ticker": "Symbol"})
     profiles: dict[str, dict[str, Any]] = {}
-    for _, row in df.iterrows():
+    # Plain dict records avoid building a boxed Series per row as iterrows() does.
+    for row in df.to_dict("records"):
         symbol = _clean_text(row.get("Symbol")).upper()
         if not symbol:
             continue
@@ -267,7 +312,8 @@ def _load_profile_cache() -> dict[str, dict[str, Any]]:
             cached = json.loads(PROFILE_CACHE_PATH.read_text(encoding="utf-8"))
             for key, value in cached.items():
                 if isinstance(value, dict):
-                    profiles[key.upper()] = {**profiles.get(key.upper(), {}), **value}
+                    # Upsert in place rather than rebuilding the merged dict per symbol.
+                    profiles.setdefault(key.upper(), {}).update(value)
         except Exception as exc:
             logger.warning("failed to read profile cache: %s", exc)
     return profiles
@@ -326,10 +372,9 @@ def _save_estimate_cache(cache: dict[str, dict[str, Any]]) -> None:
     ESTIMATE_CACHE_PATH.write_text(json.dumps(cache, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
-def _parse_date(value: Any) -> pd.Timestamp | None:
-    text = _clean_text(value)
-    if not text:
-        return None
+@lru_cache(maxsize=8192)
+def _parse_date_text(text: str) -> pd.Timestamp | None:
+    # Statement/estimate dates repeat across symbols (quarter ends), so parse each string once.
     try:
         ts = pd.Timestamp(text)
         if ts.tzinfo is not None:
@@ -339,14 +384,26 @@ def _parse_date(value: Any) -> pd.Timestamp | None:
         return None
 
 
-def _statement_available(item: dict[str, Any], asof_ts: pd.Timestamp | None) -> bool:
+def _parse_date(value: Any) -> pd.Timestamp | None:
+    text = _clean_text(value)
+    if not text:
+        return None
+    return _parse_date_text(text)
+
+
+def _statement_available(
+    item: dict[str, Any],
+    asof_ts: pd.Timestamp | None,
+    period_end: pd.Timestamp | None = None,
+) -> bool:
     if asof_ts is None:
         return True
     asof_ts = asof_ts.normalize()
     filing = _parse_date(item.get("acceptedDate") or item.get("fillingDate") or item.get("filingDate"))
     if filing is not None:
         return filing <= asof_ts
-    period_end = _parse_date(item.get("date"))
+    if period_end is None:
+        period_end = _parse_date(item.get("date"))
     return bool(period_end is not None and period_end <= asof_ts)
 
 
@@ -358,9 +415,25 @@ def _growth(current: Any, base: Any) -> float:
     return current_value / abs(base_value) - 1
 
 
+def _eps_value(item: dict[str, Any]) -> float:
+    """Reported EPS, falling back to diluted EPS only when EPS is missing (0.0 is a valid EPS)."""
+    eps = item.get("eps")
+    if eps is None or eps == "":
+        eps = item.get("epsdiluted")
+    return _safe_float(eps, math.nan)
+
+
 def _compute_fundamentals(items: list[dict[str, Any]], asof_ts: pd.Timestamp | None = None) -> dict[str, float | None]:
-    usable = [item for item in items if isinstance(item, dict) and _statement_available(item, asof_ts)]
-    usable.sort(key=lambda item: _parse_date(item.get("date")) or pd.Timestamp.min, reverse=True)
+    # Parse each statement's period end once and reuse it for the availability check and the sort.
+    dated: list[tuple[pd.Timestamp, dict[str, Any]]] = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        period_end = _parse_date(item.get("date"))
+        if _statement_available(item, asof_ts, period_end):
+            dated.append((period_end or pd.Timestamp.min, item))
+    dated.sort(key=lambda pair: pair[0], reverse=True)
+    usable = [item for _, item in dated]
     if not usable:
         return {}
     latest = usable[0]
@@ -368,13 +441,13 @@ def _compute_fundamentals(items: list[dict[str, Any]], asof_ts: pd.Timestamp | N
     prev_prev_q = usable[2] if len(usable) > 2 else {}
     year_ago = usable[4] if len(usable) > 4 else {}
     prev_year_ago = usable[5] if len(usable) > 5 else {}
-    latest_eps = _safe_float(latest.get("eps") or latest.get("epsdiluted"), math.nan)
-    prev_eps = _safe_float(prev_q.get("eps") or prev_q.get("epsdiluted"), math.nan)
-    prev_prev_eps = _safe_float(prev_prev_q.get("eps") or prev_prev_q.get("epsdiluted"), math.nan)
-    year_ago_eps = _safe_float(year_ago.get("eps") or year_ago.get("epsdiluted"), math.nan)
-    prev_year_ago_eps = _safe_float(prev_year_ago.get("eps") or prev_year_ago.get("epsdiluted"), math.nan)
+    latest_eps = _eps_value(latest)
+    prev_eps = _eps_value(prev_q)
+    prev_prev_eps = _eps_value(prev_prev_q)
+    year_ago_eps = _eps_value(year_ago)
+    prev_year_ago_eps = _eps_value(prev_year_ago)
     ttm_revenue = sum(_safe_float(item.get("revenue"), math.nan) for item in usable[:4])
-    ttm_eps_values = [_safe_float(item.get("eps") or item.get("epsdiluted"), math.nan) for item in usable[:4]]
+    ttm_eps_values = [_eps_value(item) for item in usable[:4]]
     ttm_eps = sum(ttm_eps_values) if all(np.isfinite(value) for value in ttm_eps_values) else math.nan
 
     return {
@@ -428,9 +501,7 @@ def _load_symbol_news(
     if fetch_state.get("count", 0) >= MAX_NEWS_FETCH:
         return []
 
-    try:
-        import requests
-    except Exception:
+    if requests is None:
         logger.warning("requests is not installed; skipping FMP news enrichment")
         return []
 
@@ -451,7 +522,7 @@ def _load_symbol_news(
         if fetch_state.get("count", 0) >= MAX_NEWS_FETCH:
             break
         try:
-            response = requests.get(url, params=params, timeout=20)
+            response = _http_session().get(url, params=params, timeout=20)
             response.raise_for_status()
             fetch_state["count"] = fetch_state.get("count", 0) + 1
             payload = response.json()
@@ -598,15 +669,13 @@ def _fetch_fundamentals(
     if fetch_state.get("count", 0) >= MAX_FUNDAMENTAL_FETCH:
         return {}
 
-    try:
-        import requests
-    except Exception:
+    if requests is None:
         logger.warning("requests is not installed; skipping FMP fundamental enrichment")
         return {}
 
     url = f"https://financialmodelingprep.com/api/v3/income-statement/{symbol}"
     try:
-        response = requests.get(url, params={"period": "quarter", "limit": 12, "apikey": api_key}, timeout=20)
+        response = _http_session().get(url, params={"period": "quarter", "limit": 12, "apikey": api_key}, timeout=20)
         response.raise_for_status()
         payload = response.json()
         fetch_state["count"] = fetch_state.get("count", 0) + 1
@@ -722,9 +791,7 @@ def _fetch_estimates(
     if fetch_state.get("count", 0) >= MAX_ESTIMATE_FETCH:
         return {}
 
-    try:
-        import requests
-    except Exception:
+    if requests is None:
         logger.warning("requests is not installed; skipping FMP estimate enrichment")
         return {}
 
@@ -733,7 +800,7 @@ def _fetch_estimates(
         if fetch_state.get("count", 0) >= MAX_ESTIMATE_FETCH:
             break
         try:
-            response = requests.get(
+            response = _http_session().get(
                 f"https://financialmodelingprep.com/api/v3/analyst-estimates/{symbol}",
                 params={"period": period, "limit": 12 if period == "quarter" else 8, "apikey": api_key},
                 timeout=20,
@@ -762,28 +829,35 @@ def _fetch_missing_profiles(symbols: list[str], profiles: dict[str, dict[str, An
     if not missing:
         return profiles
 
-    try:
-        import requests
-    except Exception:
+    if requests is None:
         logger.warning("requests is not installed; skipping FMP profile enrichment")
         return profiles
 
     logger.info("Fetching FMP profiles for %d symbols...", len(missing))
-    for i in range(0, len(missing), 50):
-        chunk = missing[i : i + 50]
+    session = _http_session()
+
+    def fetch_chunk(chunk: list[str]) -> list[dict[str, Any]]:
         url = f"https://financialmodelingprep.com/api/v3/profile/{','.join(chunk)}"
         try:
-            response = requests.get(url, params={"apikey": api_key}, timeout=30)
+            response = session.get(url, params={"apikey": api_key}, timeout=30)
             response.raise_for_status()
             payload = response.json()
-            if not isinstance(payload, list):
-                continue
+            return payload if isinstance(payload, list) else []
+        except Exception as exc:
+            logger.warning("FMP profile fetch failed for %s: %s", ",".join(chunk[:3]), exc)
+            return []
+
+    chunks = [missing[i : i + 50] for i in range(0, len(missing), 50)]
+    with ThreadPoolExecutor(max_workers=min(PROFILE_FETCH_WORKERS, len(chunks))) as pool:
+        # map() yields in submission order, so later chunks still win on overlap as before.
+        for payload in pool.map(fetch_chunk, chunks):
             for item in payload:
+                if not isinstance(item, dict):
+                    continue
                 symbol = _clean_text(item.get("symbol")).upper()
                 if not symbol:
                     continue
-                profiles[symbol] = {
-                    **profiles.get(symbol, {}),
+                profiles.setdefault(symbol, {}).update({
                     "symbol": symbol,
                     "companyName": _clean_text(item.get("companyName") or item.get("companyName")),
                     "sector": _clean_text(item.get("sector")),
@@ -791,9 +865,7 @@ def _fetch_missing_profiles(symbols: list[str], profiles: dict[str, dict[str, An
                     "country": _clean_text(item.get("country")),
                     "mktCap": _safe_float(item.get("mktCap"), math.nan),
                     "exchange": _clean_text(item.get("exchangeShortName") or item.get("exchange")),
-                }
-        except Exception as exc:
-            logger.warning("FMP profile fetch failed for %s: %s", ",".join(chunk[:3]), exc)
+                })
     _save_profile_cache(profiles)
     return profiles
 
@@ -811,7 +883,79 @@ def _is_structural_industry(industry: str, sector: str) -> bool:
 def _to_series(frame: pd.DataFrame, symbol: str) -> pd.Series:
     if symbol not in frame.columns:
         return pd.Series(dtype=float)
-    return pd.to_numeric(frame[symbol], errors="coerce").dropna()
+    # Frames come from _field(), which has already coerced every column to numeric.
+    return frame[symbol].dropna()
+
+
+def _fully_valid_rows(
+    symbols: list[str],
+    close_df: pd.DataFrame,
+    volume_df: pd.DataFrame,
+    high_df: pd.DataFrame,
+    low_df: pd.DataFrame,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Close and volume matrices for symbols plus the mask of rows where close/volume/high/low are all present."""
+    cols = pd.Index(symbols)
+    close_v = close_df.reindex(columns=cols).to_numpy(dtype=np.float64)
+    volume_v = volume_df.reindex(columns=cols).to_numpy(dtype=np.float64)
+    valid = ~np.isnan(close_v) & ~np.isnan(volume_v)
+    for frame in (high_df, low_df):
+        valid &= frame.reindex(columns=cols).notna().to_numpy()
+    return close_v, volume_v, valid
+
+
+def _prefilter_symbols(
+    symbols: list[str],
+    close_v: np.ndarray,
+    volume_v: np.ndarray,
+    valid: np.ndarray,
+    min_bars: int = 220,
+) -> list[str]:
+    """
+    Column-wise version of the loop's cheap gates: >= min_bars fully populated rows,
+    last close >= MIN_CLOSE and 20-bar average dollar volume >= MIN_DOLLAR_VOLUME20.
+    """
+    if not symbols:
+        return []
+    enough = valid.sum(axis=0) >= min_bars
+    last_row = valid.shape[0] - 1 - np.argmax(valid[::-1], axis=0)
+    last_close = close_v[last_row, np.arange(len(symbols))]
+    # Average dollar volume over each column's last 20 fully populated rows
+    in_tail = valid & (np.cumsum(valid[::-1], axis=0)[::-1] <= 20)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_dv20 = np.where(in_tail, close_v * volume_v, 0.0).sum(axis=0) / in_tail.sum(axis=0)
+        keep = (
+            enough
+            & np.isfinite(last_close)
+            & (last_close >= MIN_CLOSE)
+            # Summation order differs from the loop's tail(20).mean(); the slack keeps this gate
+            # from dropping a symbol the loop would keep, and the loop re-checks the exact value.
+            & (avg_dv20 >= MIN_DOLLAR_VOLUME20 * (1 - 1e-9))
+        )
+    return [symbol for symbol, ok in zip(symbols, keep) if ok]
+
+
+def _trailing_returns(
+    symbols: list[str],
+    close_v: np.ndarray,
+    valid: np.ndarray,
+    days: tuple[int, ...],
+) -> dict[int, dict[str, float]]:
+    """Batch _last_return over the fully populated rows of every column: {days: {symbol: return}}."""
+    cols = np.arange(len(symbols))
+    # Number of valid rows from each row to the bottom; the bar `d` sessions back is where it equals d + 1.
+    valid_from_end = np.cumsum(valid[::-1], axis=0)[::-1]
+    last_row = valid.shape[0] - 1 - np.argmax(valid[::-1], axis=0)
+    last_close = close_v[last_row, cols]
+    out: dict[int, dict[str, float]] = {}
+    for d in days:
+        hit = valid & (valid_from_end == d + 1)
+        base = close_v[np.argmax(hit, axis=0), cols]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ok = hit.any(axis=0) & np.isfinite(base) & (base > 0)
+            returns = np.where(ok, last_close / base - 1, math.nan)
+        out[d] = dict(zip(symbols, returns.tolist()))
+    return out
 
 
 def _last_return(series: pd.Series, days: int) -> float:
@@ -836,76 +980,97 @@ def _up_down_volume_ratio(close: pd.Series, volume: pd.Series, days: int = 20) -
     return up / down
 
 
-def _atr_pct(high: pd.Series, low: pd.Series, close: pd.Series, days: int = 14) -> float:
-    common = close.dropna().index.intersection(high.dropna().index).intersection(low.dropna().index)
-    if len(common) < days + 2:
+def _atr_pct(high: np.ndarray, low: np.ndarray, close: np.ndarray, days: int = 14) -> float:
+    """high/low/close: aligned, NaN-free float64 arrays (the ranking loop's fully populated rows)."""
+    if len(close) < days + 2:
         return math.nan
-    high_v = high.reindex(common).to_numpy(dtype=np.float64)
-    low_v = low.reindex(common).to_numpy(dtype=np.float64)
-    close_v = close.reindex(common).to_numpy(dtype=np.float64)
-    tr = _true_range_numba(high_v, low_v, close_v)
-    atr = float(pd.Series(tr, index=common).tail(days).mean())
-    last_close = float(close_v[-1])
+    # The last `days` true ranges only need the last days + 1 bars; the first TR of the slice has no prior close.
+    tail = slice(-(days + 1), None)
+    tr = _true_range_numba(high[tail], low[tail], close[tail])
+    atr = float(tr[1:].mean())
+    last_close = float(close[-1])
     return atr / last_close if last_close > 0 else math.nan
 
 
-def _find_signal_date(close: pd.Series, volume: pd.Series, spy_close: pd.Series | None) -> pd.Timestamp | None:
+def _rolling_mean(series: pd.Series, window: int) -> pd.Series:
+    """
+    series.rolling(window).mean() via bottleneck's moving window when it is installed.
+    Only for values compared against thresholds: the running sum is not exact over flat windows.
+    """
+    if bn is None:
+        return series.rolling(window).mean()
+    values = bn.move_mean(series.to_numpy(dtype=np.float64), window=window, min_count=window)
+    return pd.Series(values, index=series.index)
+
+
+def _find_signal_date(close: pd.Series, volume: pd.Series, spy_ret60_series: pd.Series | None) -> pd.Timestamp | None:
+    """spy_ret60_series: SPY pct_change(60), computed once per run by the caller."""
     if len(close) < 80:
         return None
+    # Price SMAs stay on pandas: its rolling mean is exact over flat windows, which the strict
+    # close > SMA checks depend on; bottleneck's running sum can drift by an ulp there.
     sma10 = close.rolling(10).mean()
     sma20 = close.rolling(20).mean()
-    vol20 = volume.rolling(20).mean()
-    spy_ret60 = spy_close.pct_change(60).reindex(close.index) if spy_close is not None and len(spy_close) else None
+    vol20 = _rolling_mean(volume, 20)
+    spy_ret60 = spy_ret60_series.reindex(close.index) if spy_ret60_series is not None else None
     ret20 = close.pct_change(20)
     ret60 = close.pct_change(60)
     dollar_volume = close * volume
-    avg_dv20 = dollar_volume.rolling(20).mean()
+    avg_dv20 = _rolling_mean(dollar_volume, 20)
 
     start = max(60, len(close) - 126)
-    candidates: list[pd.Timestamp] = []
-    for idx in range(start, len(close)):
-        date = close.index[idx]
-        resid_spy = ret60.iloc[idx] - (spy_ret60.loc[date] if spy_ret60 is not None and date in spy_ret60.index else 0.0)
-        gap_or_displacement = ret20.iloc[idx] > 0.18 or close.iloc[idx] / sma20.iloc[idx] > 1.12
-        volume_confirm = volume.iloc[idx] / vol20.iloc[idx] >= 1.4 or avg_dv20.iloc[idx] >= MIN_DOLLAR_VOLUME20
-        trend_ok = close.iloc[idx] > sma10.iloc[idx] and close.iloc[idx] > sma20.iloc[idx]
-        if trend_ok and gap_or_displacement and volume_confirm and ret60.iloc[idx] > 0.15 and resid_spy > -0.05:
-            candidates.append(date)
-    return candidates[-1] if candidates else None
+    # Evaluate the signal predicate for every bar at once and keep the latest hit in the window.
+    resid_spy = ret60 - spy_ret60 if spy_ret60 is not None else ret60
+    gap_or_displacement = (ret20 > 0.18) | (close / sma20 > 1.12)
+    volume_confirm = (volume / vol20 >= 1.4) | (avg_dv20 >= MIN_DOLLAR_VOLUME20)
+    trend_ok = (close > sma10) & (close > sma20)
+    signal = trend_ok & gap_or_displacement & volume_confirm & (ret60 > 0.15) & (resid_spy > -0.05)
+    hits = np.flatnonzero(signal.to_numpy()[start:])
+    return close.index[start + hits[-1]] if len(hits) else None
 
 
 def _find_pullback_entry(close: pd.Series, low: pd.Series, signal_date: pd.Timestamp) -> pd.Timestamp:
     signal_pos = close.index.get_loc(signal_date)
-    sma10 = close.rolling(10).mean()
     signal_low = float(low.loc[signal_date]) if signal_date in low.index else math.nan
-    for idx in range(signal_pos + 1, min(len(close), signal_pos + 31)):
-        date = close.index[idx]
-        if not np.isfinite(sma10.iloc[idx]):
-            continue
-        touched = low.iloc[idx] <= sma10.iloc[idx] * 1.025
-        held = close.iloc[idx] >= sma10.iloc[idx] * 0.99
-        above_signal_low = not np.isfinite(signal_low) or low.iloc[idx] > signal_low
-        if touched and held and above_signal_low:
-            return date
+    # First bar within 30 sessions after the signal that dips to the 10-day SMA, holds it and stays above the signal low.
+    window = slice(signal_pos + 1, min(len(close), signal_pos + 31))
+    sma10 = _rolling_mean(close, 10).to_numpy()[window]
+    close_w = close.to_numpy()[window]
+    low_w = low.to_numpy()[window]
+    touched = low_w <= sma10 * 1.025
+    held = close_w >= sma10 * 0.99
+    above_signal_low = low_w > signal_low if np.isfinite(signal_low) else True
+    hits = np.flatnonzero(np.isfinite(sma10) & touched & held & above_signal_low)
+    if len(hits):
+        return close.index[window.start + hits[0]]
     return close.index[min(signal_pos + 1, len(close) - 1)]
 
 
+def _tail_mean(values: np.ndarray, window: int) -> float:
+    """Latest value of rolling(window).mean(), computed from the trailing window only."""
+    tail = values[-window:]
+    # pandas returns a constant window's value exactly; a summed mean can land an ulp off
+    # and flip the strict SMA comparisons for flat (halted, pending-acquisition) closes.
+    if (tail == tail[0]).all():
+        return float(tail[0])
+    return math.fsum(tail) / window
+
+
 def _classify_price(close: pd.Series) -> str:
     if len(close) < 200:
         return "early_trend_unconfirmed"
-    sma10 = close.rolling(10).mean()
-    sma20 = close.rolling(20).mean()
-    sma50 = close.rolling(50).mean()
-    sma150 = close.rolling(150).mean()
-    sma200 = close.rolling(200).mean()
-    last = close.iloc[-1]
-    if last > sma10.iloc[-1] and sma10.iloc[-1] > sma20.iloc[-1] and sma50.iloc[-1] > sma150.iloc[-1] > sma200.iloc[-1]:
-        if last / sma50.iloc[-1] > 1.45:
+    # Only the latest value of each SMA is needed, so average the trailing windows
+    # without building full rolling series.
+    values = close.to_numpy(dtype=float)
+    sma10, sma20, sma50, sma150, sma200 = (_tail_mean(values, window) for window in (10, 20, 50, 150, 200))
+    last = values[-1]
+    if last > sma10 and sma10 > sma20 and sma50 > sma150 > sma200:
+        if last / sma50 > 1.45:
             return "extended_but_intact"
         return "strong"
-    if last > sma20.iloc[-1] and last > sma50.iloc[-1] and sma50.iloc[-1] > sma150.iloc[-1]:
+    if last > sma20 and last > sma50 and sma50 > sma150:
         return "constructive"
-    if last < sma50.iloc[-1] or sma50.iloc[-1] < sma150.iloc[-1]:
+    if last < sma50 or sma50 < sma150:
         return "weakening"
     return "mixed"
 
@@ -974,6 +1139,14 @@ def _state(price_state: str, volume_state: str, supply_severity: str, data_integ
     return "thesis_mixed", "mixed_watch"
 
 
+# Label -> priority points; unknown labels score 0.
+_PRICE_STATE_POINTS = {"extended_but_intact": 5, "strong": 5, "constructive": 3, "mixed": 1}
+_VOLUME_STATE_POINTS = {"durable_accumulation": 5, "supportive": 3, "neutral": 1}
+_SUPPLY_SEVERITY_POINTS = {"low": 3, "medium": 1, "high": -4}
+_CATALYST_POINTS = {"structural_or_industry_rerating": 3, "price_volume_catalyst_detected": 2}
+_FUNDAMENTAL_POINTS = {"structural_proxy_confirmed": 3, "price_led_needs_fundamental_check": 1}
+
+
 def _priority_points(
     price_state: str,
     volume_state: str,
@@ -984,11 +1157,11 @@ def _priority_points(
     avg_dv20: float,
 ) -> int:
     points = 0
-    points += {"extended_but_intact": 5, "strong": 5, "constructive": 3, "mixed": 1}.get(price_state, 0)
-    points += {"durable_accumulation": 5, "supportive": 3, "neutral": 1}.get(volume_state, 0)
-    points += {"low": 3, "medium": 1, "high": -4}.get(supply_severity, 0)
-    points += {"structural_or_industry_rerating": 3, "price_volume_catalyst_detected": 2}.get(catalyst, 0)
-    points += {"structural_proxy_confirmed": 3, "price_led_needs_fundamental_check": 1}.get(fundamental, 0)
+    points += _PRICE_STATE_POINTS.get(price_state, 0)
+    points += _VOLUME_STATE_POINTS.get(volume_state, 0)
+    points += _SUPPLY_SEVERITY_POINTS.get(supply_severity, 0)
+    points += _CATALYST_POINTS.get(catalyst, 0)
+    points += _FUNDAMENTAL_POINTS.get(fundamental, 0)
     points += 3 if ret60_resid_spy > 0.25 else 1 if ret60_resid_spy > 0 else -2
     points += 2 if avg_dv20 >= 5_000_000 else 0
     return points
@@ -1106,6 +1279,8 @@ def build_recognition_gap_ranking(
     symbols = sorted(set(close_df.columns).intersection(volume_df.columns))
     spy_close = _to_series(close_df, "SPY") if "SPY" in close_df.columns else None
     spy_ret60 = _last_return(spy_close, 60) if spy_close is not None and len(spy_close) else 0.0
+    # The SPY 60-day return path is the same for every symbol; only its alignment differs.
+    spy_ret60_series = spy_close.pct_change(60) if spy_close is not None and len(spy_close) else None
 
     profiles = _fetch_missing_profiles(symbols, _load_profile_cache())
     fundamental_cache = _load_fundamental_cache()
@@ -1115,43 +1290,55 @@ def build_recognition_gap_ranking(
     estimate_cache = _load_estimate_cache()
     estimate_fetch_state = {"count": 0}
     rows: list[RecognitionGapRow] = []
+    # Every symbol is evaluated against the same last bar; fundamentals are only
+    # restricted to it for point-in-time (asof) runs.
+    asof_ts = pd.Timestamp(data.index[-1])
+    fundamentals_asof = asof_ts if asof_date else None
+
+    # Drop short-history / sub-MIN_CLOSE / illiquid symbols in one vectorized pass before the per-symbol loop.
+    close_v, volume_v, valid = _fully_valid_rows(symbols, close_df, volume_df, high_df, low_df)
+    candidates = _prefilter_symbols(symbols, close_v, volume_v, valid)
+    logger.info("Recognition gap pre-filter: %d of %d symbols", len(candidates), len(symbols))
+    symbol_pos = {symbol: i for i, symbol in enumerate(symbols)}
+    candidate_cols = [symbol_pos[symbol] for symbol in candidates]
+    trailing_returns = _trailing_returns(
+        candidates, close_v[:, candidate_cols], valid[:, candidate_cols], (20, 60, 126, 252)
+    )
 
-    for symbol in symbols:
+    for symbol in candidates:
         if symbol in {"SPY", "QQQ", "IWM"}:
             continue
-        close = _to_series(close_df, symbol)
-        volume = _to_series(volume_df, symbol)
-        high = _to_series(high_df, symbol)
-        low = _to_series(low_df, symbol)
-        common = close.index.intersection(volume.index).intersection(high.index).intersection(low.index)
-        if len(common) < 220:
+        # Profile-only rejection first: it needs no price series.
+        profile = profiles.get(symbol, {})
+        if _is_biotech(profile):
             continue
-        close = close.reindex(common)
-        volume = volume.reindex(common)
-        high = high.reindex(common)
-        low = low.reindex(common)
+        ret60 = trailing_returns[60][symbol]
+        if not np.isfinite(ret60) or ret60 < 0.15:
+            continue
+        # Rows where close/volume/high/low are all present come straight from the shared mask,
+        # instead of dropna() on four series and intersecting their indexes.
+        present = valid[:, symbol_pos[symbol]]
+        if np.count_nonzero(present) < 220:
+            continue
+        close = close_df[symbol][present]
+        volume = volume_df[symbol][present]
+        high = high_df[symbol][present]
+        low = low_df[symbol][present]
 
         last_close = float(close.iloc[-1])
         if not np.isfinite(last_close) or last_close < MIN_CLOSE:
             continue
 
-        profile = profiles.get(symbol, {})
-        if _is_biotech(profile):
-            continue
-
         dollar_volume = close * volume
         avg_dv20 = float(dollar_volume.tail(20).mean())
         if avg_dv20 < MIN_DOLLAR_VOLUME20:
             continue
 
-        ret20 = _last_return(close, 20)
-        ret60 = _last_return(close, 60)
-        ret126 = _last_return(close, 126)
-        ret252 = _last_return(close, 252)
-        if not np.isfinite(ret60) or ret60 < 0.15:
-            continue
+        ret20 = trailing_returns[20][symbol]
+        ret126 = trailing_returns[126][symbol]
+        ret252 = trailing_returns[252][symbol]
 
-        signal_date = _find_signal_date(close, volume, spy_close)
+        signal_date = _find_signal_date(close, volume, spy_ret60_series)
         if signal_date is None:
             continue
         entry_date = _find_pullback_entry(close, low, signal_date)
@@ -1165,9 +1352,12 @@ def build_recognition_gap_ranking(
         pre_dv = float(dollar_volume.iloc[pre_start:signal_pos].mean()) if signal_pos > pre_start else math.nan
         post_dv = float(dollar_volume.iloc[signal_pos : min(len(dollar_volume), signal_pos + 20)].mean())
         dv_persistence = post_dv / pre_dv if pre_dv and np.isfinite(pre_dv) and pre_dv > 0 else math.nan
-        volume_ratio20 = float(volume.iloc[-1] / volume.tail(20).mean()) if volume.tail(20).mean() > 0 else math.nan
+        avg_volume20 = float(volume.tail(20).mean())
+        volume_ratio20 = float(volume.iloc[-1]) / avg_volume20 if avg_volume20 > 0 else math.nan
         up_down = _up_down_volume_ratio(close, volume)
-        atr14_pct = _atr_pct(high, low, close)
+        atr14_pct = _atr_pct(
+            high.to_numpy(dtype=np.float64), low.to_numpy(dtype=np.float64), close.to_numpy(dtype=np.float64)
+        )
         ret60_resid_spy = ret60 - spy_ret60
 
         industry = _clean_text(profile.get("industry"))
@@ -1181,7 +1371,7 @@ def build_recognition_gap_ranking(
             symbol,
             fundamental_cache,
             fundamental_fetch_state,
-            pd.Timestamp(data.index[-1]) if asof_date else None,
+            fundamentals_asof,
         )
         revenue_yoy = _safe_float(fundamentals.get("revenue_yoy"), math.nan)
         revenue_qoq = _safe_float(fundamentals.get("revenue_qoq"), math.nan)
@@ -1193,7 +1383,6 @@ def build_recognition_gap_ranking(
         eps_qoq_prev = _safe_float(fundamentals.get("eps_qoq_prev"), math.nan)
         ttm_revenue = _safe_float(fundamentals.get("ttm_revenue"), math.nan)
         ttm_eps = _safe_float(fundamentals.get("ttm_eps"), math.nan)
-        asof_ts = pd.Timestamp(data.index[-1])
         estimates = _fetch_estimates(symbol, estimate_cache, estimate_fetch_state, fundamentals, asof_ts)
         next_quarter_revenue_est = _safe_float(estimates.get("next_quarter_revenue_est"), math.nan)
         next_quarter_eps_est = _safe_float(estimates.get("next_quarter_eps_est"), math.nan)
@@ -1361,18 +1550,21 @@ def build_recognition_gap_ranking(
             )
         )
 
-    rows.sort(
-        key=lambda r: (
+    def rank_key(r: RecognitionGapRow) -> tuple:
+        return (
             r.thesis_state != "thesis_intact",
             -r.recommendation_priority,
             -r.ret60_resid_spy,
             -r.post_signal_dv_persistence if np.isfinite(r.post_signal_dv_persistence) else 0,
             -r.avg_dollar_volume20,
         )
-    )
+
     row_limit = parse_top_n(top_n)
-    if row_limit is not None:
-        rows = rows[:row_limit]
+    if row_limit is not None and row_limit < len(rows):
+        # Only the top rows are kept: a bounded heap selection is stable and matches sorted(...)[:row_limit].
+        rows = heapq.nsmallest(row_limit, rows, key=rank_key)
+    else:
+        rows.sort(key=rank_key)
     for idx, row in enumerate(rows, start=1):
         row.rank = idx
     if fundamental_fetch_state.get("count", 0):
@@ -1391,7 +1583,7 @@ def build_recognition_gap_ranking(
         "entry_rule": "industry_theme_ep_ex_biotech",
         "entry_timing": "pullback10",
         "exit_rule": "stage2_or_atr8",
-        "ranking": [asdict(row) for row in rows],
+        "ranking": [_row_to_dict(row) for row in rows],
         "notes": [
             "ランキングは監視と乗り換え比較用であり、自動買付指示ではありません。",
             "出口は機械ルールを優先し、7層評価は持続力とリスクを説明します。",
@@ -6,6 +6,8 @@ import numpy as np
 import datetime
 import subprocess
 import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from backend.get_tickers import update_stock_csv_from_fmp
 from backend.rdt_data_fetcher import get_unique_symbols, download_price_data, merge_price_data, save_price_data, load_existing_price_data
 from backend.chart_generator_mx import RDTChartGenerator
@@ -24,8 +26,34 @@ DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
 STOCK_CSV_PATH = os.path.join(PROJECT_ROOT, 'stock.csv') # Save to root for rdt_data_fetcher
 LATEST_JSON_PATH = os.path.join(DATA_DIR, 'latest.json')
 
+# Pickles produced by run_calculation_scripts() and read by both screening and chart generation
+CALCULATION_PICKLES = [
+    "atr_trailing_stop_weekly.pkl",
+    "rs_percentile_histogram_weekly.pkl",
+    "rs_volatility_adjusted_weekly.pkl",
+    "zone_rs_weekly.pkl",
+    "rti_weekly.pkl",
+    "price_data_ohlcv.pkl",
+]
+
+# Concurrency is opt-in: each script loads the full price_data_ohlcv.pkl (peak memory scales with
+# the worker count) and the numba parallel=True scripts already use every core on their own.
+CALCULATION_WORKERS = int(os.getenv("CALCULATION_WORKERS", "1"))
+
+def _run_calculation_script(script):
+    logger.info(f"Running {script}...")
+    try:
+        # Run using the same python interpreter
+        subprocess.run([sys.executable, script], check=True, cwd=PROJECT_ROOT)
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Error running {script}: {e}")
+
 def run_calculation_scripts():
-    """Runs the 5 calculation scripts as subprocesses."""
+    """
+    Runs the 5 calculation scripts as subprocesses, one at a time by default.
+    Each script only reads price_data_ohlcv.pkl and writes its own pickle,
+    so CALCULATION_WORKERS > 1 may run them concurrently.
+    """
     scripts = [
         "backend/calculate_atr_trailing_stop.py",
         "backend/calculate_rs_percentile_histogram.py",
@@ -34,14 +62,18 @@ def run_calculation_scripts():
         "backend/calculate_zone_rs.py"
     ]
 
-    for script in scripts:
-        logger.info(f"Running {script}...")
-        try:
-            # Run using the same python interpreter
-            subprocess.run([sys.executable, script], check=True, cwd=PROJECT_ROOT)
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Error running {script}: {e}")
-            pass
+    with ThreadPoolExecutor(max_workers=max(1, CALCULATION_WORKERS)) as pool:
+        list(pool.map(_run_calculation_script, scripts))
+
+def write_json_atomic(path, data):
+    """
+    Writes JSON to a temp file in the same directory and swaps it into place,
+    so the API never reads a half-written latest.json / {date}.json.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
 
 def load_pickle(filename):
     path = os.path.join(DATA_DIR, filename)
@@ -49,6 +81,56 @@ def load_pickle(filename):
         return pd.read_pickle(path)
     return None
 
+def load_calculation_data(price_data=None):
+    """
+    Loads every calculation pickle once: {filename: data or None}.
+    price_data: OHLCV frame already in memory; used instead of re-reading price_data_ohlcv.pkl.
+    """
+    calc_data = {}
+    for filename in CALCULATION_PICKLES:
+        if filename == "price_data_ohlcv.pkl" and price_data is not None:
+            calc_data[filename] = price_data
+        else:
+            calc_data[filename] = load_pickle(filename)
+    return calc_data
+
+def latest_valid_values(frame, offset=0):
+    """
+    Vectorized equivalent of frame[col].dropna().iloc[-1 - offset] for every column.
+    Columns with too few valid values map to NaN.
+    """
+    values = frame.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    # Count of valid rows from each row to the bottom; the target row is where it equals offset + 1.
+    valid_from_end = np.cumsum(valid[::-1], axis=0)[::-1]
+    hit = valid & (valid_from_end == offset + 1)
+    rows = np.argmax(hit, axis=0)
+    out = values[rows, np.arange(values.shape[1])]
+    out[~hit.any(axis=0)] = np.nan
+    return pd.Series(out, index=frame.columns)
+
+def calculate_adr_pct(high, low, days=20):
+    """
+    Calculates 20-day Average Daily Range % for every column:
+    Mean((High / Low - 1) * 100) over the last `days` valid High/Low values.
+    Columns with fewer than `days` valid Highs get 0.0.
+    """
+    high_v = high.to_numpy(dtype=float)
+    low_v = low.to_numpy(dtype=float)
+    high_valid = ~np.isnan(high_v)
+    low_valid = ~np.isnan(low_v)
+
+    # Same rows as high.dropna().tail(days) / low.dropna().tail(days), aligned on date
+    in_high_tail = high_valid & (np.cumsum(high_valid[::-1], axis=0)[::-1] <= days)
+    in_low_tail = low_valid & (np.cumsum(low_valid[::-1], axis=0)[::-1] <= days)
+    both = in_high_tail & in_low_tail
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        daily_ranges = np.where(both, (high_v / low_v - 1) * 100, 0.0)
+        adr = daily_ranges.sum(axis=0) / both.sum(axis=0)
+    adr[high_valid.sum(axis=0) < days] = 0.0
+    return pd.Series(adr, index=high.columns)
+
 def calculate_entry_date(ticker, atr_state_series, rs_perc_series, rs_ma_series, zone_series, lookback_weeks=52):
     """
     Backtracks to find the most recent continuous 'Entry' date for a ticker.
@@ -73,19 +155,13 @@ def calculate_entry_date(ticker, atr_state_series, rs_perc_series, rs_ma_series,
     - Return final current_entry_date if is_holding is True.
     """
     try:
-        # Align all series to common index
-        common_idx = atr_state_series.index.intersection(rs_perc_series.index).intersection(zone_series.index)
         if ticker in rs_ma_series.columns:
-             ma_s = rs_ma_series[ticker].reindex(common_idx)
+             ma_s = rs_ma_series[ticker]
         else:
              return None # Missing data
 
-        atr_s = atr_state_series[ticker].reindex(common_idx)
-        perc_s = rs_perc_series[ticker].reindex(common_idx)
-        zone_s = zone_series[ticker].reindex(common_idx)
-
-        # Calculate Slope Series
-        slope_s = ma_s.diff()
+        # Align all series to common index
+        common_idx = atr_state_series.index.intersection(rs_perc_series.index).intersection(zone_series.index)
 
         # Sort index
         common_idx = common_idx.sort_values()
@@ -97,15 +173,29 @@ def calculate_entry_date(ticker, atr_state_series, rs_perc_series, rs_ma_series,
         if valid_idx.empty:
             return None
 
+        # Plain arrays over the lookback window: the loop below is positional, no per-date .loc
+        # Slope is taken on the full common index so the first lookback week still has a prior value
+        atr_v = atr_state_series[ticker].reindex(valid_idx).to_numpy()
+        zone_v = zone_series[ticker].reindex(valid_idx).to_numpy()
+
+        # Not in the IN state this week: the final week forces an exit and cannot re-enter,
+        # so skip the backward scan entirely.
+        if atr_v[-1] == 0 or zone_v[-1] != 3:
+            return None
+
+        slope_s = ma_s.reindex(common_idx).diff()
+        perc_v = rs_perc_series[ticker].reindex(valid_idx).to_numpy()
+        slope_v = slope_s.reindex(valid_idx).to_numpy()
+
         is_holding = False
-        current_entry_date = None
+        current_entry_idx = None
 
-        for date in valid_idx:
+        for i in range(len(valid_idx)):
             # Values at this date
-            t_state = atr_s.loc[date]
-            perc = perc_s.loc[date]
-            slope = slope_s.loc[date]
-            zone = zone_s.loc[date]
+            t_state = atr_v[i]
+            perc = perc_v[i]
+            slope = slope_v[i]
+            zone = zone_v[i]
 
             # Logic
             # Exit Check first? Or Entry?
@@ -114,7 +204,7 @@ def calculate_entry_date(ticker, atr_state_series, rs_perc_series, rs_ma_series,
                 # Exit Logic: ATR Sell (0) OR Zone != Power (3)
                 if t_state == 0 or zone != 3:
                     is_holding = False
-                    current_entry_date = None
+                    current_entry_idx = None
 
             # If not holding (or just exited), check Entry
             if not is_holding:
@@ -124,17 +214,17 @@ def calculate_entry_date(ticker, atr_state_series, rs_perc_series, rs_ma_series,
                     pd.notna(slope) and slope > 0 and
                     zone == 3):
                     is_holding = True
-                    current_entry_date = date.strftime('%Y-%m-%d')
+                    current_entry_idx = i
 
         if is_holding:
-            return current_entry_date
+            return valid_idx[current_entry_idx].strftime('%Y-%m-%d')
         return None
 
     except Exception as e:
         logger.error(f"Error calculating entry date for {ticker}: {e}")
         return None
 
-def apply_screening_logic(is_weekend_screening=True, data_date=None):
+def apply_screening_logic(is_weekend_screening=True, data_date=None, calc_data=None):
     """
     Applies Entry and Exit logic to determine the list of Strong Stocks.
     Returns a list of dicts.
@@ -142,16 +232,19 @@ def apply_screening_logic(is_weekend_screening=True, data_date=None):
     is_weekend_screening: If True, calculates Entry/Exit/Persistence based on weekly criteria.
                           If False, only updates metrics (ADR%, Price) for existing list.
     data_date: The date of the data being used (datetime object or Timestamp). Used for versioning filenames.
+    calc_data: Optional result of load_calculation_data(), so callers can share one load with chart generation.
     """
     logger.info(f"Applying Screening Logic (Weekend Mode: {is_weekend_screening})...")
 
     # 1. Load Data
-    atr_data = load_pickle("atr_trailing_stop_weekly.pkl")
-    rs_perc_data = load_pickle("rs_percentile_histogram_weekly.pkl")
-    rs_vol_data = load_pickle("rs_volatility_adjusted_weekly.pkl")
-    zone_data = load_pickle("zone_rs_weekly.pkl")
-    rti_data = load_pickle("rti_weekly.pkl")
-    price_data = load_pickle("price_data_ohlcv.pkl")
+    if calc_data is None:
+        calc_data = load_calculation_data()
+    atr_data = calc_data.get("atr_trailing_stop_weekly.pkl")
+    rs_perc_data = calc_data.get("rs_percentile_histogram_weekly.pkl")
+    rs_vol_data = calc_data.get("rs_volatility_adjusted_weekly.pkl")
+    zone_data = calc_data.get("zone_rs_weekly.pkl")
+    rti_data = calc_data.get("rti_weekly.pkl")
+    price_data = calc_data.get("price_data_ohlcv.pkl")
 
     if atr_data is None or rs_perc_data is None or rs_vol_data is None or zone_data is None or rti_data is None or price_data is None:
         logger.error("Missing calculation data. Aborting screening.")
@@ -159,9 +252,9 @@ def apply_screening_logic(is_weekend_screening=True, data_date=None):
 
     # Get latest tickers from price data
     if isinstance(price_data.columns, pd.MultiIndex):
-        all_tickers = price_data.columns.get_level_values(1).unique().tolist()
+        all_tickers = price_data.columns.get_level_values(1).unique()
     else:
-        all_tickers = []
+        all_tickers = pd.Index([])
 
     # Load Previous Tracked List
     old_tracked_map = {} # {ticker: entry_date}
@@ -182,6 +275,12 @@ def apply_screening_logic(is_weekend_screening=True, data_date=None):
 
     final_stocks = {} # {ticker: entry_date}
 
+    # Helper to get latest scalar from a latest_valid_values() snapshot
+    def get_latest(snapshot, ticker):
+        value = snapshot.get(ticker)
+        if value is None or pd.isna(value): return None
+        return value
+
     if not is_weekend_screening:
         # Weekday: Just keep the old list
         final_stocks = old_tracked_map
@@ -197,57 +296,32 @@ def apply_screening_logic(is_weekend_screening=True, data_date=None):
         entry_candidates = set() # (ticker, entry_date)
         keep_candidates = set() # (ticker, entry_date)
 
-        # Helper to get latest scalar
-        def get_latest(df_or_series, ticker):
-            if ticker not in df_or_series.columns: return None
-            series = df_or_series[ticker].dropna()
-            if series.empty: return None
-            return series.iloc[-1]
-
-        for ticker in all_tickers:
-            try:
-                # --- Latest Values for Screening ---
-                t_state = get_latest(atr_state, ticker)
-                perc = get_latest(rs_perc, ticker)
-                zone = get_latest(zone_vals, ticker)
-
-                slope = None
-                if ticker in rs_ma.columns:
-                    ma_series = rs_ma[ticker].dropna()
-                    if len(ma_series) >= 2:
-                        slope = ma_series.iloc[-1] - ma_series.iloc[-2]
-
-                # --- Entry Logic ---
-                is_new_entry = False
-                if (t_state == 3 and
-                    perc is not None and perc >= 80 and
-                    slope is not None and slope > 0 and
-                    zone == 3):
-                    is_new_entry = True
-
-                    # Determine Entry Date
-                    if ticker in old_tracked_map:
-                        entry_date = old_tracked_map[ticker]
-                    else:
-                        entry_date = calculate_entry_date(ticker, atr_state, rs_perc, rs_ma, zone_vals)
-                        if not entry_date:
-                            entry_date = datetime.datetime.now().strftime('%Y-%m-%d') # Fallback
-
-                    entry_candidates.add((ticker, entry_date))
-
-                # --- Persistence Logic (Keep) ---
-                if not is_new_entry and ticker in old_tracked_map:
-                    is_excluded = False
-                    if t_state == 0: is_excluded = True
-                    if zone != 3: is_excluded = True
-
-                    if not is_excluded:
-                        # Keep
-                        entry_date = old_tracked_map[ticker]
-                        keep_candidates.add((ticker, entry_date))
-
-            except Exception as e:
-                continue
+        # Latest valid value per ticker, computed once per frame and aligned to the price universe
+        latest_state = latest_valid_values(atr_state).reindex(all_tickers)
+        latest_perc = latest_valid_values(rs_perc).reindex(all_tickers)
+        latest_zone = latest_valid_values(zone_vals).reindex(all_tickers)
+        ma_slope = (latest_valid_values(rs_ma) - latest_valid_values(rs_ma, offset=1)).reindex(all_tickers)
+
+        # --- Entry / Keep Logic (vectorized over all tickers; NaN compares False) ---
+        # Entry: ATR==3 AND Perc>=80 AND Slope>0 AND Zone==3
+        # Keep:  previously tracked, not a new entry, ATR != Sell(0) AND Zone==3
+        is_power = (latest_zone == 3).to_numpy()
+        entry_mask = is_power & (latest_state == 3).to_numpy() & (latest_perc >= 80).to_numpy() & (ma_slope > 0).to_numpy()
+        keep_mask = is_power & ~entry_mask & ~(latest_state == 0).to_numpy() & all_tickers.isin(list(old_tracked_map))
+
+        for ticker in all_tickers[entry_mask]:
+            # Determine Entry Date
+            if ticker in old_tracked_map:
+                entry_date = old_tracked_map[ticker]
+            else:
+                entry_date = calculate_entry_date(ticker, atr_state, rs_perc, rs_ma, zone_vals)
+                if not entry_date:
+                    entry_date = datetime.datetime.now().strftime('%Y-%m-%d') # Fallback
+
+            entry_candidates.add((ticker, entry_date))
+
+        for ticker in all_tickers[keep_mask]:
+            keep_candidates.add((ticker, old_tracked_map[ticker]))
 
         # Combine
         for t, d in entry_candidates:
@@ -260,64 +334,34 @@ def apply_screening_logic(is_weekend_screening=True, data_date=None):
     # --- Build Output with Metrics (Updated Daily) ---
     strong_stocks = []
 
-    rti_vals = rti_data["RTI_Values"]
-    rti_sigs = rti_data["RTI_Signals"]
+    # Metrics only for the tickers being reported, computed (and rounded to 2 places) column-wise in one pass
+    report_tickers = list(final_stocks)
+    latest_rti = latest_valid_values(rti_data["RTI_Values"]).reindex(report_tickers).round(2)
+    latest_rti_sig = latest_valid_values(rti_data["RTI_Signals"])
 
-    def get_latest_val(df_or_series, ticker):
-        if ticker not in df_or_series.columns: return None
-        series = df_or_series[ticker].dropna()
-        if series.empty: return None
-        return series.iloc[-1]
-
-    def get_price_info(ticker):
-        try:
-            if ticker in price_data['Close'].columns:
-                s = price_data['Close'][ticker].dropna()
-                if not s.empty: return s.iloc[-1]
-        except: pass
-        return 0.0
-
-    def calculate_adr_pct(ticker):
-        """Calculates 20-day Average Daily Range %"""
-        try:
-            # Need High/Low/Close from price_data
-            # Access MultiIndex
-            high = price_data['High'][ticker]
-            low = price_data['Low'][ticker]
-            # close = price_data['Close'][ticker] # Not needed for formula (H/L) but usually normalized by something?
-            # Standard ADR% formula: Mean((High/Low - 1) * 100) over 20 days?
-            # Or (High - Low) / Close?
-            # Memory says: "ADR% (20日間の平均日中変動率)"
-            # Typically: ((High / Low) - 1) * 100
-
-            # Use last 20 days
-            high = high.dropna().tail(20)
-            low = low.dropna().tail(20)
-
-            if len(high) < 20: return 0.0
-
-            daily_ranges = ((high / low) - 1) * 100
-            return daily_ranges.mean()
-        except:
-            return 0.0
+    latest_close = latest_valid_values(price_data['Close'].reindex(columns=report_tickers)).fillna(0.0).round(2)
+    adr_pct_map = calculate_adr_pct(
+        price_data['High'].reindex(columns=report_tickers),
+        price_data['Low'].reindex(columns=report_tickers),
+    ).round(2)
 
     for ticker, e_date in final_stocks.items():
-        rti = get_latest_val(rti_vals, ticker)
-        rti_signal = get_latest_val(rti_sigs, ticker)
+        rti = get_latest(latest_rti, ticker)
+        rti_signal = get_latest(latest_rti_sig, ticker)
         is_orange_dot = (rti_signal == 2)
 
-        price = get_price_info(ticker)
-        adr_pct = calculate_adr_pct(ticker)
+        price = latest_close[ticker]
+        adr_pct = adr_pct_map[ticker]
 
         # Determine chart date string
         chart_date_str = data_date.strftime('%Y%m%d') if data_date else datetime.datetime.now().strftime('%Y%m%d')
 
         stock_obj = {
             "ticker": ticker,
-            "rti": round(rti, 2) if rti is not None else 0.0,
+            "rti": rti if rti is not None else 0.0,
             "is_orange_dot": bool(is_orange_dot),
-            "current_price": round(price, 2),
-            "adr_pct": round(adr_pct, 2),
+            "current_price": price,
+            "adr_pct": adr_pct,
             "rvol": 0.0,
             "breakout_status": "",
             "entry_date": e_date,
@@ -327,27 +371,71 @@ def apply_screening_logic(is_weekend_screening=True, data_date=None):
 
     return strong_stocks
 
-def generate_charts(stock_list, data_date=None):
-    """Generates charts for all strong stocks."""
+# Chart rendering is CPU-bound (mplfinance/matplotlib), so it can be spread over processes.
+# Each worker reads the calculation pickles itself, so memory grows with the worker count.
+CHART_WORKERS = int(os.getenv("CHART_WORKERS", str(min(2, os.cpu_count() or 1))))
+
+# Per spawned worker process: generator built once and reused for every chart that worker renders.
+_worker_chart_generator = None
+
+def _init_chart_worker(data_dir):
+    global _worker_chart_generator
+    _worker_chart_generator = RDTChartGenerator(data_folder=data_dir)
+
+def _render_chart(generator, task):
+    ticker, filename = task
+    try:
+        generator.generate_chart(ticker, filename)
+        return ticker, None
+    except Exception as e:
+        return ticker, str(e)
+
+def _generate_chart_task(task):
+    return _render_chart(_worker_chart_generator, task)
+
+def generate_charts(stock_list, data_date=None, calc_data=None):
+    """Generates charts for all strong stocks. calc_data: optional preloaded pickles (see load_calculation_data)."""
     if not stock_list:
         return
 
     logger.info(f"Generating charts for {len(stock_list)} stocks...")
-    generator = RDTChartGenerator()
 
     # Determine date string for filenames
     chart_date_str = data_date.strftime('%Y%m%d') if data_date else datetime.datetime.now().strftime('%Y%m%d')
+    tasks = [
+        (stock['ticker'], os.path.join(DATA_DIR, f"{chart_date_str}-{stock['ticker']}.png"))
+        for stock in stock_list
+    ]
 
-    for stock in stock_list:
-        ticker = stock['ticker']
-        filename = os.path.join(DATA_DIR, f"{chart_date_str}-{ticker}.png")
-        try:
-            generator.generate_chart(ticker, filename)
-        except Exception as e:
-            logger.error(f"Failed to generate chart for {ticker}: {e}")
+    workers = min(CHART_WORKERS, len(tasks))
+    if workers <= 1:
+        # Local generator, so the preloaded pickles are released once rendering is done
+        generator = RDTChartGenerator(preloaded=calc_data, data_folder=DATA_DIR)
+        results = [_render_chart(generator, task) for task in tasks]
+    else:
+        # The screener runs inside the web server's executor threads, so workers are spawned
+        # rather than forked (a forked child can inherit a lock held by another thread).
+        # They load the pickles from DATA_DIR instead of receiving calc_data.
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_chart_worker,
+            initargs=(DATA_DIR,),
+        )
+        with pool:
+            results = list(pool.map(_generate_chart_task, tasks))
+
+    for ticker, error in results:
+        if error:
+            logger.error(f"Failed to generate chart for {ticker}: {error}")
+
+def run_screener_process(force_weekend_mode=False, market_summary=None):
+    """
+    Main Orchestrator.
 
-def run_screener_process(force_weekend_mode=False):
-    """Main Orchestrator."""
+    market_summary: Latest market analysis entry (dict with 'market_status' and 'status_text').
+                    When given, it is written into the daily JSON directly so the files are saved once.
+    """
     logger.info("Starting Screener Process...")
 
     # 1. Update Universe
@@ -417,56 +505,68 @@ def run_screener_process(force_weekend_mode=False):
         is_weekend_screening = True
 
     # 5. Screen (with mode)
-    strong_stocks = apply_screening_logic(is_weekend_screening=is_weekend_screening, data_date=data_date)
-
-    # Fundamental Analysis
-    if strong_stocks:
-        tickers_to_analyze = [s['ticker'] for s in strong_stocks]
-        logger.info("Running fundamental analysis...")
-        fund_results = analyze_tickers_in_batch(tickers_to_analyze, delay=0.5)
-
-        # Merge results
-        for s in strong_stocks:
-            ticker = s['ticker']
-            if ticker in fund_results:
-                res = fund_results[ticker]
-                s['earnings_accel'] = res['earnings']['accelerating']
-                s['revenue_accel'] = res['revenue']['accelerating']
-                s['earnings_display'] = res['earnings']['display']
-                s['revenue_display'] = res['revenue']['display']
+    # Load the calculation outputs once; screening and chart generation share them.
+    # final_data is what was just written to price_data_ohlcv.pkl, so reuse it rather than unpickling it again.
+    calc_data = load_calculation_data(price_data=final_data)
+    strong_stocks = apply_screening_logic(is_weekend_screening=is_weekend_screening, data_date=data_date, calc_data=calc_data)
 
     # 6. Charts
-    generate_charts(strong_stocks, data_date=data_date)
+    generate_charts(strong_stocks, data_date=data_date, calc_data=calc_data)
 
-    # 7. Recognition Gap EP 7-layer ranking
-    recognition_gap_result = {}
-    x_post_assets = {}
-    try:
-        logger.info("Building Recognition Gap EP 7-layer ranking...")
-        recognition_gap_top_n = parse_top_n(os.getenv("RECOGNITION_GAP_TOP_N", "0"))
-        recognition_gap_result = build_recognition_gap_ranking(
-            asof_date=data_date.strftime('%Y-%m-%d'),
-            top_n=recognition_gap_top_n,
-            price_data=final_data,
-        )
-        save_ranking(recognition_gap_result)
-        prompt_path = write_consensus_prompt(recognition_gap_result)
-        logger.info(f"Wrote opencode go consensus prompt: {prompt_path}")
-
-        if os.getenv("RECOGNITION_GAP_RENDER_X_IMAGES", "true").lower() == "true":
-            x_post_assets = publish_x_ranking_assets(
-                asof_label=data_date.strftime('%Y-%m-%d'),
+    # Fundamental Analysis
+    # Network-bound, and nothing before the JSON output reads it, so it runs in the background
+    # while the ranking is built. Chart workers are spawned, not forked, so this extra thread is never
+    # copied into a child process.
+    # The with-block shuts the worker down even if the ranking or the merge raises.
+    with ThreadPoolExecutor(max_workers=1) as fundamentals_pool:
+        fund_future = None
+        if strong_stocks:
+            tickers_to_analyze = [s['ticker'] for s in strong_stocks]
+            logger.info("Running fundamental analysis...")
+            fund_future = fundamentals_pool.submit(analyze_tickers_in_batch, tickers_to_analyze, delay=0.5)
+
+        # 7. Recognition Gap EP 7-layer ranking
+        recognition_gap_result = {}
+        x_post_assets = {}
+        try:
+            logger.info("Building Recognition Gap EP 7-layer ranking...")
+            recognition_gap_top_n = parse_top_n(os.getenv("RECOGNITION_GAP_TOP_N", "0"))
+            recognition_gap_result = build_recognition_gap_ranking(
+                asof_date=data_date.strftime('%Y-%m-%d'),
                 top_n=recognition_gap_top_n,
-                post_x=os.getenv("X_POST_ENABLED", "false").lower() == "true",
-                include_title=os.getenv("X_INCLUDE_TITLE", "false").lower() == "true",
+                price_data=final_data,
             )
-    except Exception as e:
-        logger.error(f"Recognition Gap ranking failed: {e}", exc_info=True)
-        recognition_gap_result = {
-            "date": data_date.strftime('%Y-%m-%d'),
-            "ranking": [],
-            "error": str(e),
-        }
+            save_ranking(recognition_gap_result)
+            prompt_path = write_consensus_prompt(recognition_gap_result)
+            logger.info(f"Wrote opencode go consensus prompt: {prompt_path}")
+
+            if os.getenv("RECOGNITION_GAP_RENDER_X_IMAGES", "true").lower() == "true":
+                x_post_assets = publish_x_ranking_assets(
+                    asof_label=data_date.strftime('%Y-%m-%d'),
+                    top_n=recognition_gap_top_n,
+                    post_x=os.getenv("X_POST_ENABLED", "false").lower() == "true",
+                    include_title=os.getenv("X_INCLUDE_TITLE", "false").lower() == "true",
+                )
+        except Exception as e:
+            logger.error(f"Recognition Gap ranking failed: {e}", exc_info=True)
+            recognition_gap_result = {
+                "date": data_date.strftime('%Y-%m-%d'),
+                "ranking": [],
+                "error": str(e),
+            }
+
+        if fund_future is not None:
+            fund_results = fund_future.result()
+
+            # Merge results
+            for s in strong_stocks:
+                ticker = s['ticker']
+                if ticker in fund_results:
+                    res = fund_results[ticker]
+                    s['earnings_accel'] = res['earnings']['accelerating']
+                    s['revenue_accel'] = res['revenue']['accelerating']
+                    s['earnings_display'] = res['earnings']['display']
+                    s['revenue_display'] = res['revenue']['display']
 
     # 8. Notification Logic (Count stocks with ADR% >= 4.0)
     filtered_count = sum(1 for s in strong_stocks if s.get('adr_pct', 0) >= 4.0)
@@ -491,11 +591,12 @@ def run_screener_process(force_weekend_mode=False):
         },
         "last_updated": datetime.datetime.now().isoformat()
     }
+    if market_summary:
+        output_data['market_status'] = market_summary['market_status']
+        output_data['status_text'] = market_summary['status_text']
 
-    with open(os.path.join(DATA_DIR, f"{today_str}.json"), 'w') as f:
-        json.dump(output_data, f)
-    with open(LATEST_JSON_PATH, 'w') as f:
-        json.dump(output_data, f)
+    write_json_atomic(os.path.join(DATA_DIR, f"{today_str}.json"), output_data)
+    write_json_atomic(LATEST_JSON_PATH, output_data)
 
     logger.info("Screener Process Complete.")
     return output_data
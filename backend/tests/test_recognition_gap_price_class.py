@@ -0,0 +1,48 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Ensure backend is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from backend.recognition_gap_ranking import _classify_price
+
+
+def _rolling_classify(close):
+    """Reference classification built from full pandas rolling means."""
+    sma10, sma20, sma50, sma150, sma200 = (close.rolling(w).mean().iloc[-1] for w in (10, 20, 50, 150, 200))
+    last = close.iloc[-1]
+    if last > sma10 and sma10 > sma20 and sma50 > sma150 > sma200:
+        return "extended_but_intact" if last / sma50 > 1.45 else "strong"
+    if last > sma20 and last > sma50 and sma50 > sma150:
+        return "constructive"
+    if last < sma50 or sma50 < sma150:
+        return "weakening"
+    return "mixed"
+
+
+class TestClassifyPrice(unittest.TestCase):
+
+    def test_flat_tail_matches_rolling_mean(self):
+        # Halted / pending-acquisition names keep reporting the same close;
+        # the trailing SMAs must equal that close exactly, as pandas does.
+        rng = np.random.default_rng(5)
+        for _ in range(2000):
+            values = 100 * np.exp(np.cumsum(rng.normal(0.001, 0.02, 260)))
+            flat = int(rng.integers(5, 260))
+            values[-flat:] = round(values[-flat], int(rng.integers(1, 4)))
+            close = pd.Series(values)
+            self.assertEqual(_classify_price(close), _rolling_classify(close))
+
+    def test_constant_series_is_mixed(self):
+        self.assertEqual(_classify_price(pd.Series([0.1] * 250)), "mixed")
+
+    def test_short_history(self):
+        self.assertEqual(_classify_price(pd.Series([1.0] * 199)), "early_trend_unconfirmed")
+
+
+if __name__ == '__main__':
+    unittest.main()